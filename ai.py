@@ -1,7 +1,15 @@
 import time
 from constants import BLACK, WHITE, BOARD_SIZE, EMPTY
-from game_logic import get_valid_moves, apply_move, is_game_over, get_score
+from game_logic import Board
 from opening_book import get_opening_move
+from endgame import LOSS, ENDGAME_TABLE_SIZE_MB, solve_endgame, solve_wld
+from search_control import SearchControl
+from search_stats import SearchStats
+from symmetry import canonical, transform_move, restore_move
+from parallel_search import get_helpers
+from time_manager import BEST_MOVE_EXTENSION, MIN_GROWTH, MAX_GROWTH, SOLVE_SHARE
+from bitboard import FULL_MASK, get_valid_moves_bitboard, get_flips_bitboard
+from transposition import ZOBRIST_BLACK, ZOBRIST_WHITE, ZOBRIST_FLIP, ZOBRIST_SIDE, EXACT, LOWERBOUND, UPPERBOUND, SCORE_SCALE, NO_MOVE, DEFAULT_TT_SIZE_MB, TranspositionTable, zobrist_key, zobrist_move
 
 # Static weights for the board
 WEIGHTS = [
@@ -15,34 +23,138 @@ WEIGHTS = [
     [100, -20, 10, 5, 5, 10, -20, 100]
 ]
 
-# Bitboard Constants
-MASK_A = 0xFEFEFEFEFEFEFEFE
-MASK_H = 0x7F7F7F7F7F7F7F7F
-FULL_MASK = 0xFFFFFFFFFFFFFFFF
+# Precompute Positional Tables
+# POSITIONAL_TABLES[q][bits] is the summed weight of the squares set in 'bits',
+# a 16-bit slice (two rows) of a bitboard starting at row 2 * q. Each table is
+# the sum of two 256-entry row tables; equal sums share one int object, which
+# keeps the four tables to about 2 MB.
+ROW_TABLES = [[sum(WEIGHTS[r][c] for c in range(8) if bits >> c & 1) for bits in range(256)] for r in range(8)]
+_weight_limit = sum(abs(w) for row in WEIGHTS for w in row)
+_weight_sums = {total: total for total in range(-_weight_limit, _weight_limit + 1)}
+POSITIONAL_TABLES = [
+    [_weight_sums[lo + hi] for hi in ROW_TABLES[2 * q + 1] for lo in ROW_TABLES[2 * q]]
+    for q in range(4)
+]
+POS_0, POS_1, POS_2, POS_3 = POSITIONAL_TABLES
 
-# Precompute Weight Masks
-WEIGHT_MASKS = {}
+# Incremental Evaluation Tables
+# Placing a piece on a square adds its weight to the mover's positional score;
+# flipping one moves its weight from one side to the other, a swing of twice
+# the weight. Both are keyed by the square's single-bit mask.
+SQUARE_WEIGHTS = {}
+FLIP_WEIGHTS = {}
 for r in range(8):
     for c in range(8):
-        w = WEIGHTS[r][c]
-        if w not in WEIGHT_MASKS:
-            WEIGHT_MASKS[w] = 0
-        WEIGHT_MASKS[w] |= (1 << (r * 8 + c))
+        SQUARE_WEIGHTS[1 << (r * 8 + c)] = WEIGHTS[r][c]
+        FLIP_WEIGHTS[1 << (r * 8 + c)] = 2 * WEIGHTS[r][c]
+
+# Phase Weights
+# PHASE_WEIGHTS[total_coins] is the (mobility, coin parity) weight pair for
+# the game phase: opening (< 20 pieces), midgame (< 50) and endgame.
+PHASE_WEIGHTS = [(2, 0)] * 20 + [(1, 1)] * 30 + [(0, 5)] * 15
+
+# Positions with at most this many empty squares are solved exactly (see endgame.py).
+ENDGAME_EMPTIES = 14
+
+# Without a game clock, the endgame solvers may take this many times the
+# per-move time limit, since a solved position settles the rest of the game.
+ENDGAME_TIME_FACTOR = 5
+
+# Positions with at most this many empty squares are first solved for
+# win/loss/draw only, which is much cheaper than the exact margin.
+WLD_EMPTIES = 18
+
+# Move Ordering
+# Each node tries the transposition table's best move first, then the
+# killer moves of its ply (moves that caused a cutoff at a sibling node),
+# then the remaining moves by history score.
+MAX_PLY = 128
+
+class MoveOrdering:
+    """
+    Killer moves per ply and history scores per square, shared by every node of a search.
+
+    History scores start at the static square weights, so an untrained table
+    orders moves like the static weights do. Every cutoff adds depth * depth
+    to the score of the move's square.
+    """
+    def __init__(self):
+        """Initialize empty killer slots and the static history scores."""
+        self.clear()
+
+    def clear(self):
+        """Forgets all killer moves and resets the history scores to the static weights."""
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        self.history = dict(SQUARE_WEIGHTS)
 
-TRANSPOSITION_TABLE = {}
+    def new_search(self):
+        """Forgets the killer moves and halves what the history has learned since it was cleared."""
+        for killers in self.killers:
+            killers[0] = killers[1] = 0
+        history = self.history
+        for bit, weight in SQUARE_WEIGHTS.items():
+            history[bit] = weight + (history[bit] - weight) // 2
+
+    def order(self, moves_mask, tt_move, ply):
+        """
+        Orders the legal moves of a node.
+
+        Args:
+            moves_mask (int): The legal move bitboard.
+            tt_move (int): The transposition table's best move as a single-bit mask, or 0.
+            ply (int): The distance from the root.
+
+        Returns:
+            list: The single-bit masks of the moves, in the order to search them.
+        """
+        first = []
+        if tt_move & moves_mask:
+            first.append(tt_move)
+        killer_1, killer_2 = self.killers[ply]
+        if killer_1 & moves_mask and killer_1 != tt_move:
+            first.append(killer_1)
+        if killer_2 & moves_mask and killer_2 != tt_move:
+            first.append(killer_2)
+            
+        move_indices = []
+        temp_moves = moves_mask & ~(tt_move | killer_1 | killer_2)
+        while temp_moves:
+            lsb = temp_moves & -temp_moves
+            move_indices.append(lsb)
+            temp_moves ^= lsb
+        move_indices.sort(key=self.history.__getitem__, reverse=True)
+        return first + move_indices
+
+    def cutoff(self, move_bit, depth, ply):
+        """
+        Records a move that caused a beta cutoff.
+
+        Args:
+            move_bit (int): The move as a single-bit mask.
+            depth (int): The remaining depth of the node.
+            ply (int): The distance from the root.
+        """
+        killers = self.killers[ply]
+        if killers[0] != move_bit:
+            killers[1] = killers[0]
+            killers[0] = move_bit
+        self.history[move_bit] += depth * depth
 
 def board_to_bitboards(board, player):
     """
     Converts the 2D board list into two 64-bit integers (bitboards).
 
     Args:
-        board (list): The 2D list representation of the board.
+        board (Board or list): The game board, either a Board or its 2D list representation.
         player (str): The current player's color.
 
     Returns:
         tuple: A tuple (own, opp) where 'own' is the bitboard for the current player
                and 'opp' is the bitboard for the opponent.
     """
+    if isinstance(board, Board):
+        return board.masks(player)
+
     own = 0
     opp = 0
     opponent = WHITE if player == BLACK else BLACK
@@ -55,353 +167,761 @@ def board_to_bitboards(board, player):
                 opp |= (1 << (r * 8 + c))
     return own, opp
 
-def get_valid_moves_bitboard(own, opp):
+def positional_score(own, opp):
     """
-    Calculates valid moves using bitwise operations.
+    Computes the static-weight positional score from scratch.
 
     Args:
         own (int): The bitboard of the current player's pieces.
         opp (int): The bitboard of the opponent's pieces.
 
     Returns:
-        int: A bitboard where set bits represent valid move positions.
+        int: The summed weights of own pieces minus those of opponent pieces.
     """
-    empty = ~(own | opp) & FULL_MASK
-    moves = 0
-    
-    # East (+1)
-    candidates = opp & ((own & MASK_H) << 1)
-    while candidates:
-        moves |= empty & ((candidates & MASK_H) << 1)
-        candidates = opp & ((candidates & MASK_H) << 1)
-        
-    # West (-1)
-    candidates = opp & ((own & MASK_A) >> 1)
-    while candidates:
-        moves |= empty & ((candidates & MASK_A) >> 1)
-        candidates = opp & ((candidates & MASK_A) >> 1)
-        
-    # South (+8)
-    candidates = opp & ((own) << 8)
-    while candidates:
-        moves |= empty & ((candidates) << 8)
-        candidates = opp & ((candidates) << 8)
-        
-    # North (-8)
-    candidates = opp & ((own) >> 8)
-    while candidates:
-        moves |= empty & ((candidates) >> 8)
-        candidates = opp & ((candidates) >> 8)
-        
-    # SE (+9)
-    candidates = opp & ((own & MASK_H) << 9)
-    while candidates:
-        moves |= empty & ((candidates & MASK_H) << 9)
-        candidates = opp & ((candidates & MASK_H) << 9)
-        
-    # SW (+7)
-    candidates = opp & ((own & MASK_A) << 7)
-    while candidates:
-        moves |= empty & ((candidates & MASK_A) << 7)
-        candidates = opp & ((candidates & MASK_A) << 7)
-        
-    # NE (-7)
-    candidates = opp & ((own & MASK_H) >> 7)
-    while candidates:
-        moves |= empty & ((candidates & MASK_H) >> 7)
-        candidates = opp & ((candidates & MASK_H) >> 7)
-        
-    # NW (-9)
-    candidates = opp & ((own & MASK_A) >> 9)
-    while candidates:
-        moves |= empty & ((candidates & MASK_A) >> 9)
-        candidates = opp & ((candidates & MASK_A) >> 9)
-        
-    return moves
+    return (POS_0[own & 0xFFFF] + POS_1[own >> 16 & 0xFFFF] + POS_2[own >> 32 & 0xFFFF] + POS_3[own >> 48]
+            - POS_0[opp & 0xFFFF] - POS_1[opp >> 16 & 0xFFFF] - POS_2[opp >> 32 & 0xFFFF] - POS_3[opp >> 48])
 
-def apply_move_bitboard(own, opp, move_mask):
+def evaluate_bitboard(own, opp, current_player_is_black):
     """
-    Applies a move on the bitboards and flips captured pieces.
+    Evaluates the board state using heuristics (Positional, Mobility, Coin Parity).
 
     Args:
         own (int): The bitboard of the current player's pieces.
         opp (int): The bitboard of the opponent's pieces.
-        move_mask (int): A bitboard with a single bit set representing the move.
+        current_player_is_black (bool): True if the current player is Black.
 
     Returns:
-        tuple: A tuple (new_own, new_opp) representing the updated board state.
+        float: The heuristic score of the board state.
     """
-    flips = 0
-    
-    # East (+1)
-    mask = (move_mask & MASK_H) << 1
-    potential = 0
-    while mask & opp:
-        potential |= mask
-        mask = (mask & MASK_H) << 1
-    if mask & own: flips |= potential
-    
-    # West (-1)
-    mask = (move_mask & MASK_A) >> 1
-    potential = 0
-    while mask & opp:
-        potential |= mask
-        mask = (mask & MASK_A) >> 1
-    if mask & own: flips |= potential
-    
-    # South (+8)
-    mask = (move_mask << 8) & FULL_MASK
-    potential = 0
-    while mask & opp:
-        potential |= mask
-        mask = (mask << 8) & FULL_MASK
-    if mask & own: flips |= potential
-    
-    # North (-8)
-    mask = (move_mask >> 8) & FULL_MASK
-    potential = 0
-    while mask & opp:
-        potential |= mask
-        mask = (mask >> 8) & FULL_MASK
-    if mask & own: flips |= potential
-    
-    # SE (+9)
-    mask = (move_mask & MASK_H) << 9
-    potential = 0
-    while mask & opp:
-        potential |= mask
-        mask = (mask & MASK_H) << 9
-    if mask & own: flips |= potential
-    
-    # SW (+7)
-    mask = (move_mask & MASK_A) << 7
-    potential = 0
-    while mask & opp:
-        potential |= mask
-        mask = (mask & MASK_A) << 7
-    if mask & own: flips |= potential
-    
-    # NE (-7)
-    mask = (move_mask & MASK_H) >> 7
-    potential = 0
-    while mask & opp:
-        potential |= mask
-        mask = (mask & MASK_H) >> 7
-    if mask & own: flips |= potential
-    
-    # NW (-9)
-    mask = (move_mask & MASK_A) >> 9
-    potential = 0
-    while mask & opp:
-        potential |= mask
-        mask = (mask & MASK_A) >> 9
-    if mask & own: flips |= potential
-    
-    return (own | move_mask | flips), (opp & ~flips)
+    return evaluate_incremental(own, opp, positional_score(own, opp), own.bit_count() - opp.bit_count())
 
-def evaluate_bitboard(own, opp, current_player_is_black):
+def evaluate_incremental(own, opp, positional, disc_diff):
     """
-    Evaluates the board state using heuristics (Positional, Mobility, Coin Parity).
+    Evaluates the board state from accumulators carried down the search.
+
+    The positional score and the disc difference only change by the placed
+    piece and its flips, so the search updates them on every move instead of
+    recomputing them here; only mobility has to be generated at the leaf.
+    The result is identical to evaluate_bitboard.
 
     Args:
         own (int): The bitboard of the current player's pieces.
         opp (int): The bitboard of the opponent's pieces.
-        current_player_is_black (bool): True if the current player is Black.
+        positional (int): The positional score of own minus opp (see positional_score).
+        disc_diff (int): The number of own pieces minus opponent pieces.
 
     Returns:
         float: The heuristic score of the board state.
     """
     # 1. Positional
-    my_score = 0
-    op_score = 0
-    for w, mask in WEIGHT_MASKS.items():
-        my_score += w * (own & mask).bit_count()
-        op_score += w * (opp & mask).bit_count()
+    score = positional
     
-    positional_score = my_score - op_score
+    total_coins = (own | opp).bit_count()
+    mobility_weight, parity_weight = PHASE_WEIGHTS[total_coins]
     
-    # 2. Mobility
-    my_moves_mask = get_valid_moves_bitboard(own, opp)
-    op_moves_mask = get_valid_moves_bitboard(opp, own)
-    my_moves_count = my_moves_mask.bit_count()
-    op_moves_count = op_moves_mask.bit_count()
-    
-    if my_moves_count + op_moves_count != 0:
-        mobility_score = 100 * (my_moves_count - op_moves_count) / (my_moves_count + op_moves_count)
-    else:
-        mobility_score = 0
+    # 2. Mobility (not weighted in the endgame, so not generated there)
+    if mobility_weight:
+        my_moves_count = get_valid_moves_bitboard(own, opp).bit_count()
+        op_moves_count = get_valid_moves_bitboard(opp, own).bit_count()
+        
+        if my_moves_count + op_moves_count != 0:
+            mobility_score = 100 * (my_moves_count - op_moves_count) / (my_moves_count + op_moves_count)
+        else:
+            mobility_score = 0
+        score = score + mobility_weight * mobility_score
         
     # 3. Coin Parity
-    my_coins = own.bit_count()
-    op_coins = opp.bit_count()
-    
-    if my_coins + op_coins != 0:
-        coin_parity_score = 100 * (my_coins - op_coins) / (my_coins + op_coins)
-    else:
-        coin_parity_score = 0
+    if parity_weight and total_coins != 0:
+        coin_parity_score = 100 * disc_diff / total_coins
+        score = score + parity_weight * coin_parity_score
         
-    total_coins = my_coins + op_coins
-    
-    if total_coins < 20:
-        return positional_score + 2 * mobility_score
-    elif total_coins < 50:
-        return positional_score + mobility_score + coin_parity_score
-    else:
-        return positional_score + 5 * coin_parity_score
-
-def minmax_bitboard(own, opp, depth, maximizing_player, alpha, beta, start_time, time_limit, player_color):
+    return score
+
+
+# Principal Variation Search
+# Scores are only resolved to the transposition table's 1/16 fixed point,
+# so a window this wide around alpha serves as the null window.
+NULL_WINDOW = 1 / SCORE_SCALE
+
+# Aspiration Windows
+# Each iterative-deepening pass starts with a window this wide on either
+# side of the previous pass's score; a search that falls outside it is
+# repeated with the window on that side widened.
+ASPIRATION_WINDOW = 25
+
+class Engine:
     """
-    The MinMax algorithm with Alpha-Beta pruning using bitboards.
+    A search engine with its own tables and configuration.
 
-    Args:
-        own (int): Bitboard for the current player.
-        opp (int): Bitboard for the opponent.
-        depth (int): The current depth of the search.
-        maximizing_player (bool): True if the current node is a maximizing node.
-        alpha (float): The alpha value for pruning.
-        beta (float): The beta value for pruning.
-        start_time (float): The time when the search started.
-        time_limit (float): The maximum allowed time for the search.
-        player_color (str): The color of the player (BLACK or WHITE).
+    Every engine owns a transposition table, an endgame table and a move
+    ordering, which it keeps warm between searches, so engines never see
+    each other's results: two engines can play each other with separate
+    memory budgets, and a worker can keep one engine per game. An engine
+    runs one search at a time.
 
-    Returns:
-        float: The best score found for the current board state.
+    Attributes:
+        table (TranspositionTable): The transposition table of the midgame search.
+        endgame_table (TranspositionTable): The table of the endgame solvers.
+        ordering (MoveOrdering): The killer moves and history scores.
+        endgame_empties (int): Positions with at most this many empty squares are solved exactly.
+        wld_empties (int): Positions with at most this many empty squares are first solved
+            for win/loss/draw.
+        workers (int): The number of processes to search with (see search_iterative).
+        use_book (bool): True if the opening book is consulted before searching.
+        collect_stats (bool): True if every get_best_move fills a new SearchStats.
+        symmetric_discs (int): Positions with at most this many discs are stored in the
+            transposition table under their canonical orientation (see symmetry.py), so
+            one entry serves all eight orientations. 0 turns this off.
+        last_stats (SearchStats): The statistics of the last search, if collected.
+        helpers (HelperPool): The engine's helper processes, once it has searched with several workers.
     """
-    if time.time() - start_time > time_limit:
-        raise TimeoutError
+    def __init__(self, tt_size_mb=DEFAULT_TT_SIZE_MB, endgame_empties=ENDGAME_EMPTIES, wld_empties=WLD_EMPTIES,
+                 workers=1, use_book=True, collect_stats=False, symmetric_discs=0):
+        """
+        Initialize an engine with empty tables.
+
+        Args:
+            tt_size_mb (float): Memory budget for the transposition table in MB.
+            endgame_empties (int): The largest number of empty squares solved exactly.
+            wld_empties (int): The largest number of empty squares solved for win/loss/draw.
+            workers (int): The number of processes to search with.
+            use_book (bool): Whether to play moves from the opening book.
+            collect_stats (bool): Whether to collect statistics about every search.
+            symmetric_discs (int): The largest number of discs of a position stored under
+                its canonical orientation, or 0 to store every position as it is.
+        """
+        self.table = TranspositionTable(tt_size_mb)
+        self.endgame_table = TranspositionTable(ENDGAME_TABLE_SIZE_MB)
+        self.ordering = MoveOrdering()
+        self.endgame_empties = endgame_empties
+        self.wld_empties = wld_empties
+        self.workers = workers
+        self.use_book = use_book
+        self.collect_stats = collect_stats
+        self.symmetric_discs = symmetric_discs
+        self.last_stats = None
+        self.helpers = None
+
+    def new_game(self):
+        """Forgets everything learned from earlier searches."""
+        self.table.clear()
+        self.endgame_table.clear()
+        self.ordering.clear()
+        self.last_stats = None
+
+    def resize(self, tt_size_mb):
+        """
+        Changes the memory budget of the transposition table, which clears it.
+
+        Args:
+            tt_size_mb (float): The new budget in MB.
+        """
+        if tt_size_mb != self.table.size_mb:
+            self.table.resize(tt_size_mb)
+
+    @property
+    def search_settings(self):
+        """dict: The settings that decide how positions are stored in the table, as keyword arguments."""
+        return {"symmetric_discs": self.symmetric_discs}
+
+    def close(self):
+        """Shuts down the engine's helper processes, if any, and frees its shared table."""
+        if self.helpers is not None:
+            self.helpers.close()
+            self.helpers = None
+
+    def table_slot(self, own, opp, key):
+        """
+        Finds where a position is stored in the transposition table.
+
+        Args:
+            own (int): Bitboard for the side to move.
+            opp (int): Bitboard for the other side.
+            key (int): The Zobrist key of the position.
+
+        Returns:
+            tuple: A tuple (key, own, opp, symmetry) with the table key and bitboards to
+            probe and store with, and the symmetry that maps the position onto them,
+            or None if it is stored as it is.
+        """
+        if self.symmetric_discs and (own | opp).bit_count() <= self.symmetric_discs:
+            table_own, table_opp, symmetry = canonical(own, opp)
+            return hash((table_own, table_opp)) & FULL_MASK, table_own, table_opp, symmetry
+        return key, own, opp, None
+
+    def probe_move(self, own, opp, key):
+        """
+        Looks up the best move the transposition table holds for a position.
+
+        Args:
+            own (int): Bitboard for the side to move.
+            opp (int): Bitboard for the other side.
+            key (int): The Zobrist key of the position.
+
+        Returns:
+            int: The move as a single-bit mask in the position's own orientation, or 0.
+        """
+        table_key, table_own, table_opp, symmetry = self.table_slot(own, opp, key)
+        entry = self.table.probe(table_key, table_own, table_opp)
+        if entry is None or entry[3] == NO_MOVE:
+            return 0
+        if symmetry is None:
+            return 1 << entry[3]
+        return restore_move(1 << entry[3], symmetry)
+
+    def get_best_move(self, board, player, time_limit=2.0, turn=None, control=None, clock=None, workers=None,
+                      stats=None, max_depth=64, return_stats=False):
+        """
+        Determines the best move for the given player using Iterative Deepening Negamax.
+
+        Every pass after the first is searched with an aspiration window around
+        the previous pass's score (see search_aspiration). When the search stops,
+        at the time limit or through control.stop(), the move of the last
+        completed pass is played.
+
+        The time for the move is a soft budget, which decides whether another
+        pass is started (see search_iterative), and a hard deadline. With a
+        clock, both come from clock.budget(); otherwise both are time_limit, and
+        the endgame solvers may use ENDGAME_TIME_FACTOR times as much before it.
+        A position with a single legal move is answered without searching.
+
+        Args:
+            board (Board or list): The current game board.
+            player (str): The color of the player.
+            time_limit (float): The time allowed per move when no clock is given (default 2.0s).
+            turn (TurnState, optional): The precomputed state of this turn. When given,
+                its bitboards and legal move mask are reused instead of recomputed.
+            control (SearchControl, optional): Lets another thread stop the search early
+                (e.g. to move now). Its deadlines are set from the time budget.
+            clock (TimeManager, optional): The player's game clock, which sets the time
+                budget for the move. The caller runs the clock (start_move/end_move).
+            workers (int, optional): The number of processes to search with, instead of
+                the engine's. Helper processes are started on first use and kept for later moves.
+            stats (SearchStats, optional): Filled in with statistics about the search
+                (see search_stats.py). With collect_stats or return_stats, a new one is
+                used by default.
+            max_depth (int): The deepest iterative-deepening pass of the midgame search.
+            return_stats (bool): If True, also return the statistics of the search.
+
+        Returns:
+            tuple: The coordinates (row, col) of the best move, or None if no move is possible.
+            With return_stats, a tuple (move, stats) of the move and its SearchStats.
+        """
+        if stats is None and (self.collect_stats or return_stats):
+            stats = SearchStats()
+        if stats is not None:
+            self.last_stats = stats
+        move = self.choose_move(board, player, time_limit, turn, control, clock, workers, stats, max_depth)
+        if return_stats:
+            return move, stats
+        return move
+
+    def choose_move(self, board, player, time_limit, turn, control, clock, workers, stats, max_depth):
+        """
+        Plays the book move or searches the position for get_best_move.
+
+        Args:
+            board (Board or list): The current game board.
+            player (str): The color of the player.
+            time_limit (float): The time allowed per move when no clock is given.
+            turn (TurnState): The precomputed state of this turn, or None.
+            control (SearchControl): Lets another thread stop the search early, or None.
+            clock (TimeManager): The player's game clock, or None.
+            workers (int): The number of processes to search with, or None for the engine's.
+            stats (SearchStats): Filled in with statistics about the search, or None.
+            max_depth (int): The deepest iterative-deepening pass of the midgame search.
+
+        Returns:
+            tuple: The coordinates (row, col) of the best move, or None if no move is possible.
+        """
+        start_time = time.time()
+        # Check Opening Book
+        if self.use_book:
+            opening_move = get_opening_move(board, player)
+            if opening_move:
+                if stats is not None:
+                    stats.phase = "book"
+                return opening_move
+
+        if turn is not None:
+            own, opp, moves_mask = turn.own, turn.opp, turn.moves_mask
+        else:
+            own, opp = board_to_bitboards(board, player)
+            moves_mask = get_valid_moves_bitboard(own, opp)
+        if moves_mask == 0:
+            return None
+        if moves_mask & (moves_mask - 1) == 0:
+            if stats is not None:
+                stats.phase = "single"
+            return bit_to_move(moves_mask)
+            
+        self.table.new_search()
+        self.ordering.new_search()
+        if control is None:
+            control = SearchControl()
+        if stats is not None:
+            control.stats = stats
+        if workers is None:
+            workers = self.workers
+        phase, move_bit, nodes = self.search_move(own, opp, player, moves_mask, control, time_limit, clock, workers,
+                                                  max_depth)
+        if stats is not None:
+            stats.phase = phase
+            stats.nodes = nodes
+            stats.time = time.time() - start_time
+        return bit_to_move(move_bit)
+
+    def search_move(self, own, opp, player, moves_mask, control, time_limit, clock, workers, max_depth):
+        """
+        Runs the endgame solvers and the iterative deepening for get_best_move.
+
+        Args:
+            own (int): Bitboard for the current player.
+            opp (int): Bitboard for the opponent.
+            player (str): The player color.
+            moves_mask (int): The legal move bitboard, with at least two moves.
+            control (SearchControl): Counts the nodes and decides when the search has to stop.
+            time_limit (float): The time allowed when no clock is given.
+            clock (TimeManager): The player's game clock, or None.
+            workers (int): The number of processes to search with.
+            max_depth (int): The deepest pass of the midgame search.
+
+        Returns:
+            tuple: A tuple (phase, move_bit, nodes) naming what decided the move ("exact",
+            "wld" or "search"), the move as a single-bit mask, and the nodes searched
+            for it, including those of any helper processes.
+        """
+        empty_count = (~(own | opp) & FULL_MASK).bit_count()
+        if clock is not None:
+            # The solvers and the normal search share one budget for the move.
+            soft_limit, hard_limit = clock.budget(empty_count)
+            solve_limit = hard_limit * SOLVE_SHARE
+            search_start = time.time()
+        else:
+            soft_limit = hard_limit = time_limit
+            solve_limit = time_limit * ENDGAME_TIME_FACTOR
+            search_start = None
         
-    state_key = (own, opp, maximizing_player)
-    
-    alpha_orig = alpha
-    beta_orig = beta
-    
-    if state_key in TRANSPOSITION_TABLE:
-        entry = TRANSPOSITION_TABLE[state_key]
-        if entry['depth'] >= depth:
-            if entry['flag'] == 'exact':
-                return entry['value']
-            elif entry['flag'] == 'lowerbound':
-                alpha = max(alpha, entry['value'])
-            elif entry['flag'] == 'upperbound':
-                beta = min(beta, entry['value'])
-            if alpha >= beta:
-                return entry['value']
+        # Endgame Solver Check
+        if empty_count <= self.endgame_empties:
+            control.start(solve_limit)
+            result = solve_endgame(own, opp, control, self.endgame_table, moves_mask)
+            if result is not None:
+                return "exact", result[1], control.nodes
+        elif empty_count <= self.wld_empties:
+            control.start(solve_limit)
+            result = solve_wld(own, opp, control, self.endgame_table, moves_mask)
+            # A proven loss is left to the normal search, which picks the
+            # move that looks hardest for the opponent to refute.
+            if result is not None and result[0] != LOSS:
+                return "wld", result[1], control.nodes
                 
-    if depth == 0:
-        return evaluate_bitboard(own, opp, player_color == BLACK)
+        control.start(hard_limit, search_start)
+        move_bit, _, _, nodes = self.search_iterative(own, opp, player, moves_mask, control, soft_limit, workers,
+                                                      max_depth=max_depth)
+        if move_bit is None:
+            # No pass completed: the best-ordered move stands in.
+            move_bit = self.ordering.order(moves_mask, 0, 0)[0]
+        return "search", move_bit, nodes
+
+    def search_iterative(self, own, opp, player, moves_mask, control, soft_limit=float('inf'), workers=1, start_depth=1,
+                         max_depth=64):
+        """
+        Runs Iterative Deepening from the root until the control stops it or the soft budget is used up.
+
+        No pass starts if its predicted time would overrun the soft budget
+        (measured from control.start_time), and the soft budget is extended up to
+        the control's deadline when the best move changes between passes.
+
+        With more than one worker, helper processes search the same position at
+        staggered depths while this one runs (Lazy SMP, see parallel_search.py).
+        They share the transposition table, so their results speed up this
+        search; only this process's passes decide the move. The engine keeps
+        its helpers for later searches until close().
+
+        Args:
+            own (int): Bitboard for the current player.
+            opp (int): Bitboard for the opponent.
+            player (str): The player color.
+            moves_mask (int): The legal move bitboard at the root.
+            control (SearchControl): Counts the nodes and decides when the search has to stop.
+            soft_limit (float): Seconds the search aims to use.
+            workers (int): The number of processes to search with, including this one.
+            start_depth (int): The depth of the first pass.
+            max_depth (int): The depth of the last pass.
+
+        Returns:
+            tuple: A tuple (move_bit, score, depth, nodes) with the best move, score and
+            depth of the last completed pass (None, None and 0 if no pass completed),
+            and the nodes searched by all workers.
+        """
+        helpers = None
+        if workers > 1:
+            helpers = self.helpers = get_helpers(self.helpers, workers - 1, self.table, self.search_settings)
+            helpers.start(own, opp, player, moves_mask, self.table.generation)
+            
+        hard_limit = float('inf') if control.deadline is None else control.deadline - control.start_time
+        depth = start_depth
         
-    moves_mask = get_valid_moves_bitboard(own, opp) if maximizing_player else get_valid_moves_bitboard(opp, own)
-    
-    if moves_mask == 0:
-        opp_moves_mask = get_valid_moves_bitboard(opp, own) if maximizing_player else get_valid_moves_bitboard(own, opp)
-        if opp_moves_mask == 0:
-            return evaluate_bitboard(own, opp, player_color == BLACK)
-        else:
-            return minmax_bitboard(own, opp, depth-1, not maximizing_player, alpha, beta, start_time, time_limit, player_color)
+        best_move_bit = None
+        score = None
+        completed_depth = 0
+        previous_pass_time = None
+        previous_growth = None
+        
+        try:
+            while depth <= max_depth and not control.poll():
+                pass_start = control.elapsed()
+                result = self.search_aspiration(own, opp, depth, score, control, player, moves_mask)
+                if result is None:
+                    break
+                score, move_bit = result
+                completed_depth = depth
+                control.report(depth, score, move_bit)
+                
+                if best_move_bit is not None and move_bit != best_move_bit:
+                    soft_limit = min(hard_limit, soft_limit * (1 + BEST_MOVE_EXTENSION))
+                best_move_bit = move_bit
+                
+                # Predict the next pass from how much this one grew over the last.
+                # Odd and even depths grow differently, so the larger of the last
+                # two growths is used.
+                elapsed = control.elapsed()
+                pass_time = elapsed - pass_start
+                growth = MAX_GROWTH
+                if previous_pass_time:
+                    last_growth = max(MIN_GROWTH, min(MAX_GROWTH, pass_time / previous_pass_time))
+                    growth = max(last_growth, previous_growth or last_growth)
+                    previous_growth = last_growth
+                previous_pass_time = pass_time
+                if elapsed + pass_time * growth > soft_limit:
+                    break
+                depth += 1
+        finally:
+            nodes = control.nodes
+            if helpers is not None:
+                nodes += helpers.stop()
+                
+        return best_move_bit, score, completed_depth, nodes
+
+    def search_aspiration(self, own, opp, depth, guess, control, player, moves_mask=None):
+        """
+        Searches the root to a fixed depth with an aspiration window around a guessed score.
+
+        The window starts ASPIRATION_WINDOW wide on each side of the guess. When
+        the result falls outside it, the side that failed is widened (doubling
+        each time) and the root is searched again.
+
+        Args:
+            own (int): Bitboard for the current player.
+            opp (int): Bitboard for the opponent.
+            depth (int): The depth to search.
+            guess (float or None): The expected score, usually the previous iteration's.
+                None searches with a full window.
+            control (SearchControl): Counts the nodes and decides when the search has to stop.
+            player (str): The player color.
+            moves_mask (int, optional): The legal move bitboard at the root, if already known.
+
+        Returns:
+            tuple: A tuple (score, move_bit) with the root score and the best move's bit,
+            or None if the search was stopped first.
+        """
+        if guess is None:
+            return self.search_root(own, opp, depth, float('-inf'), float('inf'), control, player, moves_mask)
             
-    best_val = float('-inf') if maximizing_player else float('inf')
-    
-    move_indices = []
-    temp_moves = moves_mask
-    while temp_moves:
-        lsb = temp_moves & -temp_moves
-        move_indices.append(lsb)
-        temp_moves ^= lsb
+        delta = ASPIRATION_WINDOW
+        alpha = guess - delta
+        beta = guess + delta
+        while True:
+            result = self.search_root(own, opp, depth, alpha, beta, control, player, moves_mask)
+            if result is None:
+                return None
+            score, move_bit = result
+            if score <= alpha:
+                delta *= 2
+                alpha = score - delta
+            elif score >= beta:
+                delta *= 2
+                beta = score + delta
+            else:
+                return score, move_bit
+
+    def search_root(self, own, opp, depth, alpha, beta, control, player, moves_mask=None):
+        """
+        Searches every root move to a fixed depth within a window, using Principal Variation Search.
+
+        Args:
+            own (int): Bitboard for the current player.
+            opp (int): Bitboard for the opponent.
+            depth (int): The depth to search.
+            alpha (float): The lower bound of the window.
+            beta (float): The upper bound of the window.
+            control (SearchControl): Counts the nodes and decides when the search has to stop.
+            player (str): The player color.
+            moves_mask (int, optional): The legal move bitboard at the root, if already known.
+
+        Returns:
+            tuple: A tuple (score, move_bit) with the root score and the best move's bit, or
+            None if there is no legal move or the search was stopped. A score outside the
+            window is only a bound.
+        """
+        if moves_mask is None:
+            moves_mask = get_valid_moves_bitboard(own, opp)
+        if moves_mask == 0:
+            return None
+            
+        own_is_black = player == BLACK
+        if own_is_black:
+            key = zobrist_key(own, opp, True)
+        else:
+            key = zobrist_key(opp, own, False)
+        positional = positional_score(own, opp)
+        disc_diff = own.bit_count() - opp.bit_count()
+        alpha_orig = alpha
         
-    def get_weight(move_bit):
-        for w, mask in WEIGHT_MASKS.items():
-            if mask & move_bit:
-                return w
-        return 0
+        # The previous iteration's best move is searched first.
+        tt_move = self.probe_move(own, opp, key)
+        move_indices = self.ordering.order(moves_mask, tt_move, 0)
         
-    move_indices.sort(key=get_weight, reverse=True)
-    
-    if maximizing_player:
+        best_val = float('-inf')
+        best_move = move_indices[0]
+            
         for move_bit in move_indices:
-            new_own, new_opp = apply_move_bitboard(own, opp, move_bit)
-            eval = minmax_bitboard(new_own, new_opp, depth-1, False, alpha, beta, start_time, time_limit, player_color)
-            best_val = max(best_val, eval)
+            flips = get_flips_bitboard(own, opp, move_bit)
+            child_own = opp ^ flips
+            child_opp = own | move_bit | flips
+            child_key = zobrist_move(key, move_bit, flips, own_is_black)
+            child_positional = -positional_score(child_opp, child_own)
+            child_disc_diff = child_own.bit_count() - child_opp.bit_count()
+            
+            if best_val == float('-inf'):
+                eval = -self.negamax(child_own, child_opp, depth-1, 1, -beta, -alpha, control, not own_is_black, child_key,
+                                     child_positional, child_disc_diff)
+            else:
+                eval = -self.negamax(child_own, child_opp, depth-1, 1, -alpha - NULL_WINDOW, -alpha, control, not own_is_black, child_key,
+                                     child_positional, child_disc_diff)
+                if alpha < eval < beta and not control.stopped:
+                    eval = -self.negamax(child_own, child_opp, depth-1, 1, -beta, -alpha, control, not own_is_black, child_key,
+                                         child_positional, child_disc_diff)
+            if control.stopped:
+                return None
+            
+            if eval > best_val:
+                best_val = eval
+                best_move = move_bit
+                
             alpha = max(alpha, eval)
-            if beta <= alpha:
-                break
-    else:
-        for move_bit in move_indices:
-            new_opp, new_own = apply_move_bitboard(opp, own, move_bit)
-            eval = minmax_bitboard(new_own, new_opp, depth-1, True, alpha, beta, start_time, time_limit, player_color)
-            best_val = min(best_val, eval)
-            beta = min(beta, eval)
-            if beta <= alpha:
+            if alpha >= beta:
                 break
                 
-    if best_val <= alpha_orig:
-        flag = 'upperbound'
-    elif best_val >= beta_orig:
-        flag = 'lowerbound'
-    else:
-        flag = 'exact'
+        if best_val <= alpha_orig:
+            flag = UPPERBOUND
+        elif best_val >= beta:
+            flag = LOWERBOUND
+        else:
+            flag = EXACT
+        table_key, table_own, table_opp, symmetry = self.table_slot(own, opp, key)
+        stored_move = best_move if symmetry is None else transform_move(best_move, symmetry)
+        self.table.store(table_key, table_own, table_opp, best_val, depth, flag, stored_move.bit_length() - 1)
+        return best_val, best_move
+
+    def negamax(self, own, opp, depth, ply, alpha, beta, control, own_is_black, key, positional, disc_diff):
+        """
+        The Negamax algorithm with Alpha-Beta pruning and Principal Variation Search using bitboards.
+
+        Scores are always from the point of view of the side to move. The first
+        move is searched with the full window; the remaining moves are searched
+        with a null window around alpha and only re-searched with the full window
+        when they fail high.
+
+        Args:
+            own (int): Bitboard for the side to move.
+            opp (int): Bitboard for the other side.
+            depth (int): The remaining depth of the search.
+            ply (int): The distance from the root, which selects the killer moves.
+            alpha (float): The alpha value for pruning.
+            beta (float): The beta value for pruning.
+            control (SearchControl): Counts the nodes and decides when the search has to stop.
+            own_is_black (bool): True if the side to move is Black.
+            key (int): The Zobrist key of the position, including the side to move.
+            positional (int): The positional score of own minus opp, updated incrementally.
+            disc_diff (int): The number of own pieces minus opponent pieces, updated incrementally.
+
+        Returns:
+            float: The best score found for the side to move. Once control.stopped
+            is set the value is meaningless and must be discarded.
+        """
+        control.nodes += 1
+        if control.nodes >= control.next_poll and control.poll():
+            return 0
+        # Statistics are opt-in; without them every counter is one None check.
+        stats = control.stats
+            
+        alpha_orig = alpha
+        
+        tt_move = 0
+        # Inlined table_slot: optionally, early positions are stored once for
+        # all their orientations.
+        symmetry = None
+        table_own, table_opp, table_key = own, opp, key
+        symmetric_discs = self.symmetric_discs
+        if symmetric_discs and (own | opp).bit_count() <= symmetric_discs:
+            table_own, table_opp, symmetry = canonical(own, opp)
+            table_key = hash((table_own, table_opp)) & FULL_MASK
+        entry = self.table.probe(table_key, table_own, table_opp)
+        if stats is not None:
+            stats.tt_probes += 1
+            stats.tt_hits += entry is not None
+        if entry is not None:
+            value, entry_depth, flag, move = entry
+            if move != NO_MOVE:
+                tt_move = 1 << move if symmetry is None else restore_move(1 << move, symmetry)
+            if entry_depth >= depth:
+                if flag == LOWERBOUND:
+                    alpha = max(alpha, value)
+                elif flag == UPPERBOUND:
+                    beta = min(beta, value)
+                if flag == EXACT or alpha >= beta:
+                    if stats is not None:
+                        stats.tt_cutoffs += 1
+                    return value
+                    
+        if depth == 0:
+            if stats is not None:
+                stats.leaf_evals += 1
+            return evaluate_incremental(own, opp, positional, disc_diff)
+            
+        moves_mask = get_valid_moves_bitboard(own, opp)
+        
+        if moves_mask == 0:
+            if get_valid_moves_bitboard(opp, own) == 0:
+                if stats is not None:
+                    stats.leaf_evals += 1
+                return evaluate_incremental(own, opp, positional, disc_diff)
+            return -self.negamax(opp, own, depth-1, ply+1, -beta, -alpha, control, not own_is_black, key ^ ZOBRIST_SIDE,
+                                 -positional, -disc_diff)
+                
+        move_indices = self.ordering.order(moves_mask, tt_move, ply)
         
-    TRANSPOSITION_TABLE[state_key] = {
-        'value': best_val,
-        'depth': depth,
-        'flag': flag
-    }
-    return best_val
-
-def get_best_move(board, player, time_limit=2.0):
+        best_val = float('-inf')
+        best_move = move_indices[0]
+        place = ZOBRIST_BLACK if own_is_black else ZOBRIST_WHITE
+        
+        # Make-move updates the Zobrist key and the evaluation accumulators from
+        # the same walk over the flipped pieces.
+        for move_bit in move_indices:
+            flips = get_flips_bitboard(own, opp, move_bit)
+            child_key = key ^ place[move_bit] ^ ZOBRIST_SIDE
+            gain = SQUARE_WEIGHTS[move_bit]
+            f = flips
+            while f:
+                bit = f & -f
+                child_key ^= ZOBRIST_FLIP[bit]
+                gain += FLIP_WEIGHTS[bit]
+                f ^= bit
+            swing = 1 + 2 * flips.bit_count()
+            child_own = opp ^ flips
+            child_opp = own | move_bit | flips
+            child_positional = -positional - gain
+            child_disc_diff = -disc_diff - swing
+            
+            if best_val == float('-inf'):
+                eval = -self.negamax(child_own, child_opp, depth-1, ply+1, -beta, -alpha, control, not own_is_black, child_key,
+                                     child_positional, child_disc_diff)
+            else:
+                eval = -self.negamax(child_own, child_opp, depth-1, ply+1, -alpha - NULL_WINDOW, -alpha, control, not own_is_black, child_key,
+                                     child_positional, child_disc_diff)
+                if alpha < eval < beta and not control.stopped:
+                    eval = -self.negamax(child_own, child_opp, depth-1, ply+1, -beta, -alpha, control, not own_is_black, child_key,
+                                         child_positional, child_disc_diff)
+            if control.stopped:
+                return 0
+                                             
+            if eval > best_val:
+                best_val = eval
+                best_move = move_bit
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                self.ordering.cutoff(move_bit, depth, ply)
+                if stats is not None:
+                    stats.beta_cutoffs += 1
+                    stats.first_move_cutoffs += move_bit == move_indices[0]
+                break
+                    
+        if best_val <= alpha_orig:
+            flag = UPPERBOUND
+        elif best_val >= beta:
+            flag = LOWERBOUND
+        else:
+            flag = EXACT
+            
+        if symmetry is not None:
+            best_move = transform_move(best_move, symmetry)
+        self.table.store(table_key, table_own, table_opp, best_val, depth, flag, best_move.bit_length() - 1)
+        return best_val
+
+# The engine behind the module-level functions, which the game and the
+# tools share unless they create their own. It is created on first use, so
+# importing the module (e.g. only for the Engine class) allocates no tables.
+_default_engine = None
+
+def default_engine():
+    """
+    Returns the engine behind the module-level functions, creating it on first use.
+
+    Returns:
+        Engine: The default engine.
+    """
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = Engine()
+    return _default_engine
+
+def get_best_move(board, player, time_limit=2.0, turn=None, tt_size_mb=None, control=None, clock=None, workers=1,
+                  stats=None, max_depth=64, return_stats=False):
     """
-    Determines the best move for the given player using Iterative Deepening MinMax.
+    Determines the best move for the given player with the default engine.
 
     Args:
-        board (list): The current game board.
+        board (Board or list): The current game board.
         player (str): The color of the player.
-        time_limit (float): The maximum time allowed for calculation (default 2.0s).
+        time_limit (float): The time allowed per move when no clock is given (default 2.0s).
+        turn (TurnState, optional): The precomputed state of this turn.
+        tt_size_mb (float, optional): Memory budget for the transposition table in MB.
+            The table is resized (and cleared) when this differs from its current size.
+        control (SearchControl, optional): Lets another thread stop the search early.
+        clock (TimeManager, optional): The player's game clock, which sets the time budget for the move.
+        workers (int): The number of processes to search with.
+        stats (SearchStats, optional): Filled in with statistics about the search.
+        max_depth (int): The deepest iterative-deepening pass of the midgame search.
+        return_stats (bool): If True, also return the statistics of the search.
 
     Returns:
         tuple: The coordinates (row, col) of the best move, or None if no move is possible.
+        With return_stats, a tuple (move, stats) of the move and its SearchStats.
     """
-    # Check Opening Book
-    opening_move = get_opening_move(board, player)
-    if opening_move:
-        return opening_move
+    engine = default_engine()
+    if tt_size_mb is not None:
+        engine.resize(tt_size_mb)
+    return engine.get_best_move(board, player, time_limit, turn, control, clock, workers, stats, max_depth,
+                                return_stats)
 
-    own, opp = board_to_bitboards(board, player)
-    
-    # Endgame Solver Check
-    empty_count = (~(own | opp) & FULL_MASK).bit_count()
-    if empty_count <= 12:
-        depth = empty_count
-        try:
-            return get_best_move_fixed_depth_bitboard(own, opp, depth, time_limit * 5, player)
-        except TimeoutError:
-            pass
-            
-    start_time = time.time()
-    depth = 1
-    max_depth = 64
-    
-    current_best_move = None
-    
-    try:
-        while True:
-            if time.time() - start_time > time_limit:
-                break
-            if depth > max_depth:
-                break
-                
-            move = get_best_move_fixed_depth_bitboard(own, opp, depth, time_limit, player, start_time)
-            if move:
-                current_best_move = move
-                
-            depth += 1
-            
-    except TimeoutError:
-        pass
-        
-    return current_best_move
+def bit_to_move(move_bit):
+    """
+    Converts a single-bit move mask into board coordinates.
+
+    Args:
+        move_bit (int): A bitboard with a single bit set representing the move.
+
+    Returns:
+        tuple: The coordinates (row, col) of the move.
+    """
+    idx = move_bit.bit_length() - 1
+    return (idx // 8, idx % 8)
 
-def get_best_move_fixed_depth_bitboard(own, opp, depth, time_limit, player, start_time=None):
+def get_best_move_fixed_depth_bitboard(own, opp, depth, time_limit, player, start_time=None, moves_mask=None):
     """
-    Helper function to find the best move at a fixed depth using bitboards.
+    Helper function to find the best move at a fixed depth using bitboards and the default engine.
 
     Args:
         own (int): Bitboard for the current player.
@@ -410,46 +930,15 @@ def get_best_move_fixed_depth_bitboard(own, opp, depth, time_limit, player, star
         time_limit (float): The time limit.
         player (str): The player color.
         start_time (float, optional): The start time of the search.
+        moves_mask (int, optional): The legal move bitboard at the root, if already known.
 
     Returns:
-        tuple: The coordinates (row, col) of the best move.
+        tuple: The coordinates (row, col) of the best move, or None if there is no
+        legal move or the search ran out of time.
     """
-    if start_time is None:
-        start_time = time.time()
-        
-    best_move = None
-    max_eval = float('-inf')
-    alpha = float('-inf')
-    beta = float('inf')
-    
-    moves_mask = get_valid_moves_bitboard(own, opp)
-    if moves_mask == 0:
+    control = SearchControl()
+    control.start(time_limit, start_time)
+    result = default_engine().search_root(own, opp, depth, float('-inf'), float('inf'), control, player, moves_mask)
+    if result is None:
         return None
-        
-    move_indices = []
-    temp_moves = moves_mask
-    while temp_moves:
-        lsb = temp_moves & -temp_moves
-        move_indices.append(lsb)
-        temp_moves ^= lsb
-        
-    def get_weight(move_bit):
-        for w, mask in WEIGHT_MASKS.items():
-            if mask & move_bit:
-                return w
-        return 0
-        
-    move_indices.sort(key=get_weight, reverse=True)
-        
-    for move_bit in move_indices:
-        new_own, new_opp = apply_move_bitboard(own, opp, move_bit)
-        eval = minmax_bitboard(new_own, new_opp, depth-1, False, alpha, beta, start_time, time_limit, player)
-        
-        if eval > max_eval:
-            max_eval = eval
-            idx = move_bit.bit_length() - 1
-            best_move = (idx // 8, idx % 8)
-            
-        alpha = max(alpha, eval)
-            
-    return best_move
\ No newline at end of file
+    return bit_to_move(result[1])
@@ -0,0 +1,231 @@
+from constants import BLACK
+from bitboard import get_valid_moves_bitboard, get_flips_bitboard
+from transposition import ZOBRIST_SIDE, zobrist_key, zobrist_move
+from game_logic import TurnState
+from search_control import SearchControl
+from ai import ASPIRATION_WINDOW, default_engine, positional_score, bit_to_move
+
+def analyze(board, player, depth=None, time_limit=2.0, multi_pv=False, turn=None, control=None, engine=None,
+            margin=None):
+    """
+    Analyses a position: the score of the best move and its principal variation.
+
+    The position is searched by iterative deepening until depth is reached
+    or the time runs out, and the result of the last completed pass is
+    returned. With multi_pv, every legal move is scored instead of only the
+    best one: exactly by default, or, with a margin, exactly only for the
+    moves within margin of the best and as an upper bound for the others,
+    which costs much less (see search_multi_pv). The opening book and the
+    endgame solvers are not used, so every score is the search's evaluation.
+
+    Args:
+        board (Board or list): The current game board.
+        player (str): The color of the player to move.
+        depth (int, optional): The depth to search to, or None to search until the time runs out.
+        time_limit (float, optional): Seconds allowed for the analysis, or None for no limit.
+            At least one of depth and time_limit must be set.
+        multi_pv (bool): If True, score every legal move.
+        turn (TurnState, optional): The precomputed state of this turn.
+        control (SearchControl, optional): Lets another thread stop the analysis early.
+        engine (Engine, optional): The engine to search with, whose tables keep the results;
+            the default engine (see ai.default_engine) if not given.
+        margin (float, optional): With multi_pv, how far below the best score moves are
+            still scored exactly, or None to score every move exactly.
+
+    Returns:
+        tuple: A tuple (lines, depth) with the lines of the last completed pass and
+        its depth. Each line is a tuple (score, pv, exact), best first, where pv lists
+        the moves as (row, col) coordinates, with None for a pass, and exact is False
+        if the score is only an upper bound (pv then starts with the refutation found).
+        Without multi_pv there is a single line. The lines are empty if there is no
+        legal move or no pass completed.
+
+    Raises:
+        ValueError: If neither depth nor time_limit is set.
+    """
+    if engine is None:
+        engine = default_engine()
+    if depth is None and time_limit is None:
+        raise ValueError("analysis needs a depth or a time limit")
+    if turn is None:
+        turn = TurnState(board, player)
+    own, opp, moves_mask = turn.own, turn.opp, turn.moves_mask
+    if moves_mask == 0:
+        return [], 0
+    if control is None:
+        control = SearchControl()
+    control.start(time_limit)
+    max_depth = 64 if depth is None else depth
+    engine.table.new_search()
+    engine.ordering.new_search()
+    own_is_black = player == BLACK
+
+    if not multi_pv:
+        move_bit, score, completed_depth, _ = engine.search_iterative(own, opp, player, moves_mask, control, max_depth=max_depth)
+        if move_bit is None:
+            return [], 0
+        pv = move_variation(own, opp, own_is_black, move_bit, completed_depth, engine)
+        return [(score, [bit_to_move(bit) if bit else None for bit in pv], True)], completed_depth
+
+    lines = []
+    completed_depth = 0
+    order = [(move_bit, None) for move_bit in engine.ordering.order(moves_mask, 0, 0)]
+    for pass_depth in range(1, max_depth + 1):
+        scores = search_multi_pv(own, opp, pass_depth, control, own_is_black, order, engine, margin)
+        if scores is None:
+            break
+        completed_depth = pass_depth
+        lines = []
+        for score, move_bit, exact in scores:
+            pv = move_variation(own, opp, own_is_black, move_bit, pass_depth, engine)
+            lines.append((score, [bit_to_move(bit) if bit else None for bit in pv], exact))
+        # The next pass searches the best moves first, each around its score.
+        order = [(move_bit, score) for score, move_bit, _ in scores]
+        if control.poll():
+            break
+    return lines, completed_depth
+
+def search_multi_pv(own, opp, depth, control, own_is_black, order, engine=None, margin=None):
+    """
+    Scores every root move at a fixed depth.
+
+    Each move is searched with an aspiration window around its score from
+    the previous pass, widened until the score falls inside, so every score
+    is exact rather than a bound. All of them share the transposition table
+    and the move ordering, but their trees hardly overlap, so scoring every
+    move exactly costs about as much as searching each move on its own.
+
+    With a margin, only moves within margin of the best score so far need
+    an exact score: the others are searched with the window's lower edge at
+    that threshold, and a move that fails low there keeps the upper bound.
+    Proving a bound is as cheap as the null-window searches of a best-move
+    search, so with a small margin the cost approaches a single search plus
+    an exact search of each move near the top.
+
+    Args:
+        own (int): Bitboard for the current player.
+        opp (int): Bitboard for the opponent.
+        depth (int): The depth to search.
+        control (SearchControl): Counts the nodes and decides when the search has to stop.
+        own_is_black (bool): True if the current player is Black.
+        order (list): Tuples (move_bit, guess) for the legal moves, in the order to search
+            them, where guess is the move's expected score or None.
+        engine (Engine, optional): The engine to search with; the default engine if not given.
+        margin (float, optional): How far below the best score moves are still scored
+            exactly, or None to score every move exactly.
+
+    Returns:
+        list: Tuples (score, move_bit, exact) sorted best first, where exact is False if
+        the score is an upper bound, or None if the search was stopped.
+    """
+    if engine is None:
+        engine = default_engine()
+    key = zobrist_key(own, opp, True) if own_is_black else zobrist_key(opp, own, False)
+    scores = []
+    best = None
+    for move_bit, guess in order:
+        flips = get_flips_bitboard(own, opp, move_bit)
+        child_own = opp ^ flips
+        child_opp = own | move_bit | flips
+        child_key = zobrist_move(key, move_bit, flips, own_is_black)
+        child_positional = -positional_score(child_opp, child_own)
+        child_disc_diff = child_own.bit_count() - child_opp.bit_count()
+        # Below the threshold a move only needs an upper bound, so the window never drops under it.
+        threshold = None if margin is None or best is None else best - margin
+        if threshold is not None:
+            alpha, beta = threshold, max(threshold, guess if guess is not None else threshold) + ASPIRATION_WINDOW
+        elif guess is None:
+            alpha, beta = float('-inf'), float('inf')
+        else:
+            alpha, beta = guess - ASPIRATION_WINDOW, guess + ASPIRATION_WINDOW
+        delta = ASPIRATION_WINDOW
+        exact = True
+        while True:
+            score = -engine.negamax(child_own, child_opp, depth - 1, 1, -beta, -alpha, control, not own_is_black,
+                                    child_key, child_positional, child_disc_diff)
+            if control.stopped:
+                return None
+            if score <= alpha:
+                if threshold is not None:
+                    exact = False
+                    break
+                delta *= 2
+                alpha = score - delta
+            elif score >= beta:
+                delta *= 2
+                beta = score + delta
+            else:
+                break
+        if exact and (best is None or score > best):
+            best = score
+        scores.append((score, move_bit, exact))
+    # Stable sort: equal scores keep the search order.
+    scores.sort(key=lambda line: -line[0])
+    return scores
+
+def move_variation(own, opp, own_is_black, move_bit, length, engine=None):
+    """
+    Starts a variation with a given move and follows the transposition table after it.
+
+    The root entry is not read, so the variation always starts with the
+    searched move, even if the root entry was overwritten by a pass that was
+    stopped before it completed.
+
+    Args:
+        own (int): Bitboard for the side to move.
+        opp (int): Bitboard for the other side.
+        own_is_black (bool): True if the side to move is Black.
+        move_bit (int): The first move as a single-bit mask.
+        length (int): The largest number of moves in the variation, passes included.
+        engine (Engine, optional): The engine the position was searched with; the default
+            engine if not given.
+
+    Returns:
+        list: The moves as single-bit masks, with 0 for a pass.
+    """
+    if engine is None:
+        engine = default_engine()
+    flips = get_flips_bitboard(own, opp, move_bit)
+    return [move_bit] + principal_variation(opp ^ flips, own | move_bit | flips, not own_is_black, length - 1, engine)
+
+def principal_variation(own, opp, own_is_black, length, engine=None):
+    """
+    Follows the best moves stored in the transposition table from a position.
+
+    The variation ends after length moves, at the end of the game, or where
+    the table has no move for the position (e.g. the entry was replaced).
+
+    Args:
+        own (int): Bitboard for the side to move.
+        opp (int): Bitboard for the other side.
+        own_is_black (bool): True if the side to move is Black.
+        length (int): The largest number of moves to follow, passes included.
+        engine (Engine, optional): The engine the position was searched with; the default
+            engine if not given.
+
+    Returns:
+        list: The moves as single-bit masks, with 0 for a pass.
+    """
+    if engine is None:
+        engine = default_engine()
+    key = zobrist_key(own, opp, True) if own_is_black else zobrist_key(opp, own, False)
+    pv = []
+    while len(pv) < length:
+        moves_mask = get_valid_moves_bitboard(own, opp)
+        if moves_mask == 0:
+            if get_valid_moves_bitboard(opp, own) == 0:
+                break
+            pv.append(0)
+            own, opp, own_is_black, key = opp, own, not own_is_black, key ^ ZOBRIST_SIDE
+            continue
+        move_bit = engine.probe_move(own, opp, key)
+        if not move_bit & moves_mask:
+            break
+        flips = get_flips_bitboard(own, opp, move_bit)
+        key = zobrist_move(key, move_bit, flips, own_is_black)
+        own, opp, own_is_black = opp ^ flips, own | move_bit | flips, not own_is_black
+        pv.append(move_bit)
+    # A trailing pass is not part of a variation.
+    while pv and pv[-1] == 0:
+        pv.pop()
+    return pv
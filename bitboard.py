@@ -0,0 +1,201 @@
+# Bitboard Constants
+# Square (row, col) maps to bit row * 8 + col, so bit 0 is A1 and bit 63 is H8.
+MASK_A = 0xFEFEFEFEFEFEFEFE
+MASK_H = 0x7F7F7F7F7F7F7F7F
+FULL_MASK = 0xFFFFFFFFFFFFFFFF
+MASK_INNER = MASK_A & MASK_H
+
+def _ray_mask(sq, dr, dc):
+    """
+    Builds the mask of squares from sq (exclusive) to the board edge in one direction.
+
+    Args:
+        sq (int): The starting square index.
+        dr (int): The row step.
+        dc (int): The column step.
+
+    Returns:
+        int: The ray bitboard.
+    """
+    r, c = divmod(sq, 8)
+    r += dr
+    c += dc
+    mask = 0
+    while 0 <= r < 8 and 0 <= c < 8:
+        mask |= 1 << (r * 8 + c)
+        r += dr
+        c += dc
+    return mask
+
+# Precomputed Flip Tables
+# For every square, the rays that can hold a flip (at least 2 squares long),
+# split by whether the ray runs towards higher or lower bit indices. Each entry
+# is (first, ray) where 'first' is the square adjacent to the move.
+RAYS_UP = []
+RAYS_DOWN = []
+for sq in range(64):
+    up = []
+    for dr, dc in ((0, 1), (1, -1), (1, 0), (1, 1)):
+        ray = _ray_mask(sq, dr, dc)
+        if ray.bit_count() >= 2:
+            up.append((ray & -ray, ray))
+    down = []
+    for dr, dc in ((0, -1), (-1, 1), (-1, 0), (-1, -1)):
+        ray = _ray_mask(sq, dr, dc)
+        if ray.bit_count() >= 2:
+            down.append((1 << (ray.bit_length() - 1), ray))
+    RAYS_UP.append(tuple(up))
+    RAYS_DOWN.append(tuple(down))
+
+def get_valid_moves_bitboard(own, opp):
+    """
+    Calculates valid moves using a branch-free Kogge-Stone fill.
+
+    For each of the 8 directions, the run of opponent pieces next to our own
+    pieces is extended with three doubling steps (1, 2 and 4 squares), which
+    covers the longest possible run of 6 opponent pieces in a fixed number of
+    operations. The square past the end of each run is a move if it is empty.
+
+    Horizontal and diagonal runs can never include a piece on the A or H file
+    (it would have no square on the far side), so masking the opponent
+    pieces with MASK_INNER both stops the fill from wrapping around the board
+    edge and makes a separate mask on the final shift unnecessary.
+
+    Args:
+        own (int): The bitboard of the current player's pieces.
+        opp (int): The bitboard of the opponent's pieces.
+
+    Returns:
+        int: A bitboard where set bits represent valid move positions.
+    """
+    empty = ~(own | opp) & FULL_MASK
+    inner = opp & MASK_INNER
+
+    # East (+1)
+    gen = inner & (own << 1)
+    pro = inner & (inner << 1)
+    gen |= inner & (gen << 1)
+    gen |= pro & (gen << 2)
+    pro &= pro << 2
+    gen |= pro & (gen << 4)
+    moves = gen << 1
+
+    # West (-1)
+    gen = inner & (own >> 1)
+    pro = inner & (inner >> 1)
+    gen |= inner & (gen >> 1)
+    gen |= pro & (gen >> 2)
+    pro &= pro >> 2
+    gen |= pro & (gen >> 4)
+    moves |= gen >> 1
+
+    # South (+8)
+    gen = opp & (own << 8)
+    pro = opp & (opp << 8)
+    gen |= opp & (gen << 8)
+    gen |= pro & (gen << 16)
+    pro &= pro << 16
+    gen |= pro & (gen << 32)
+    moves |= gen << 8
+
+    # North (-8)
+    gen = opp & (own >> 8)
+    pro = opp & (opp >> 8)
+    gen |= opp & (gen >> 8)
+    gen |= pro & (gen >> 16)
+    pro &= pro >> 16
+    gen |= pro & (gen >> 32)
+    moves |= gen >> 8
+
+    # SE (+9)
+    gen = inner & (own << 9)
+    pro = inner & (inner << 9)
+    gen |= inner & (gen << 9)
+    gen |= pro & (gen << 18)
+    pro &= pro << 18
+    gen |= pro & (gen << 36)
+    moves |= gen << 9
+
+    # NW (-9)
+    gen = inner & (own >> 9)
+    pro = inner & (inner >> 9)
+    gen |= inner & (gen >> 9)
+    gen |= pro & (gen >> 18)
+    pro &= pro >> 18
+    gen |= pro & (gen >> 36)
+    moves |= gen >> 9
+
+    # SW (+7)
+    gen = inner & (own << 7)
+    pro = inner & (inner << 7)
+    gen |= inner & (gen << 7)
+    gen |= pro & (gen << 14)
+    pro &= pro << 14
+    gen |= pro & (gen << 28)
+    moves |= gen << 7
+
+    # NE (-7)
+    gen = inner & (own >> 7)
+    pro = inner & (inner >> 7)
+    gen |= inner & (gen >> 7)
+    gen |= pro & (gen >> 14)
+    pro &= pro >> 14
+    gen |= pro & (gen >> 28)
+    moves |= gen >> 7
+
+    return moves & empty
+
+def get_flips_bitboard(own, opp, move_mask):
+    """
+    Calculates the pieces flipped by a move using the precomputed ray tables.
+
+    Each ray is checked in a constant number of operations: the nearest
+    square on it that is not an opponent piece is isolated with a single
+    bit trick, and if it holds one of our pieces, every ray square between
+    it and the move is flipped. Rays whose first square is not an opponent
+    piece are skipped outright.
+
+    Args:
+        own (int): The bitboard of the current player's pieces.
+        opp (int): The bitboard of the opponent's pieces.
+        move_mask (int): A bitboard with a single bit set representing the move.
+
+    Returns:
+        int: A bitboard of the opponent pieces flipped by the move.
+    """
+    sq = move_mask.bit_length() - 1
+    flips = 0
+
+    # Rays towards higher squares: the nearest blocker is the lowest set bit.
+    for first, ray in RAYS_UP[sq]:
+        if first & opp:
+            blockers = ray & ~opp
+            nearest = blockers & -blockers
+            if nearest & own:
+                flips |= ray & (nearest - 1)
+
+    # Rays towards lower squares: the nearest blocker is the highest set bit.
+    for first, ray in RAYS_DOWN[sq]:
+        if first & opp:
+            blockers = ray & ~opp
+            if blockers:
+                nearest = 1 << (blockers.bit_length() - 1)
+                if nearest & own:
+                    flips |= (ray & -nearest) ^ nearest
+
+    return flips
+
+def apply_move_bitboard(own, opp, move_mask):
+    """
+    Applies a move on the bitboards and flips captured pieces.
+
+    Args:
+        own (int): The bitboard of the current player's pieces.
+        opp (int): The bitboard of the opponent's pieces.
+        move_mask (int): A bitboard with a single bit set representing the move.
+
+    Returns:
+        tuple: A tuple (new_own, new_opp) representing the updated board state.
+    """
+    flips = get_flips_bitboard(own, opp, move_mask)
+    return (own | move_mask | flips), (opp & ~flips)
@@ -0,0 +1,386 @@
+from bitboard import MASK_A, MASK_H, FULL_MASK, get_valid_moves_bitboard, get_flips_bitboard
+from transposition import EXACT, LOWERBOUND, UPPERBOUND, NO_MOVE
+
+# Exact Endgame Solver
+# Near the end of the game the search can reach the final position, so moves
+# are scored by the exact final disc differential (own pieces minus opponent
+# pieces) instead of the heuristic evaluation.
+
+# Parity Regions
+# The four 4x4 quadrants. Playing into a region with an odd number of empty
+# squares tends to leave the last move of that region to the mover, so
+# near the end moves in odd regions are tried first.
+QUADRANTS = [0x000000000F0F0F0F, 0x00000000F0F0F0F0, 0x0F0F0F0F00000000, 0xF0F0F0F000000000]
+
+# Below this many empties moves are ordered by parity alone; above it they
+# are ordered fastest-first, which costs a move generation per child.
+FASTEST_FIRST_EMPTIES = 7
+
+# Positions with at least this many empties are stored in the table.
+TABLE_EMPTIES = 7
+
+# NEIGHBOURS[bit] is the mask of the up to eight squares adjacent to a
+# square. A move can only flip something if one of them holds an opponent
+# piece, which is a much cheaper test than computing the flips.
+NEIGHBOURS = {}
+for sq in range(64):
+    bit = 1 << sq
+    side = bit | ((bit << 1) & MASK_A) | ((bit >> 1) & MASK_H)
+    NEIGHBOURS[bit] = (side | (side << 8) | (side >> 8)) & FULL_MASK & ~bit
+
+SCORE_WIN = 64
+
+# Exact scores never mix with heuristic ones, so the solver has its own table.
+# Its keys hash the two bitboards, since the solver does not track colours.
+# Callers pass the table in: engines own one each (see ai.Engine).
+ENDGAME_TABLE_SIZE_MB = 8
+
+def parity_order(squares, empties):
+    """
+    Lists squares with those in odd-parity regions first.
+
+    Args:
+        squares (int): The bitboard of the squares to order.
+        empties (int): The bitboard of empty squares, which decides each region's parity.
+
+    Returns:
+        list: The single-bit masks of the squares.
+    """
+    odd = 0
+    for quadrant in QUADRANTS:
+        if (empties & quadrant).bit_count() & 1:
+            odd |= quadrant
+    ordered = []
+    for part in (squares & odd, squares & ~odd):
+        while part:
+            bit = part & -part
+            ordered.append(bit)
+            part ^= bit
+    return ordered
+
+def solve_1(own, opp, square):
+    """
+    Solves a position with one empty square.
+
+    Args:
+        own (int): Bitboard for the side to move.
+        opp (int): Bitboard for the other side.
+        square (int): The empty square as a single-bit mask.
+
+    Returns:
+        int: The final disc differential for the side to move.
+    """
+    diff = own.bit_count() - opp.bit_count()
+    neighbours = NEIGHBOURS[square]
+    if neighbours & opp:
+        flips = get_flips_bitboard(own, opp, square)
+        if flips:
+            return diff + 2 * flips.bit_count() + 1
+    if neighbours & own:
+        flips = get_flips_bitboard(opp, own, square)
+        if flips:
+            return diff - 2 * flips.bit_count() - 1
+    return diff
+
+def solve_2(own, opp, square_1, square_2, alpha, beta, passed=False):
+    """
+    Solves a position with two empty squares.
+
+    Args:
+        own (int): Bitboard for the side to move.
+        opp (int): Bitboard for the other side.
+        square_1 (int): The first empty square as a single-bit mask.
+        square_2 (int): The second empty square as a single-bit mask.
+        alpha (int): The alpha value for pruning.
+        beta (int): The beta value for pruning.
+        passed (bool): True if the other side has just passed.
+
+    Returns:
+        int: The final disc differential for the side to move.
+    """
+    best = -SCORE_WIN - 1
+    if NEIGHBOURS[square_1] & opp:
+        flips = get_flips_bitboard(own, opp, square_1)
+        if flips:
+            best = -solve_1(opp ^ flips, own | square_1 | flips, square_2)
+            if best >= beta:
+                return best
+    if NEIGHBOURS[square_2] & opp:
+        flips = get_flips_bitboard(own, opp, square_2)
+        if flips:
+            score = -solve_1(opp ^ flips, own | square_2 | flips, square_1)
+            if score > best:
+                best = score
+    if best > -SCORE_WIN - 1:
+        return best
+    if passed:
+        return own.bit_count() - opp.bit_count()
+    return -solve_2(opp, own, square_1, square_2, -beta, -alpha, True)
+
+def solve_small(own, opp, squares, alpha, beta, passed=False):
+    """
+    Solves a position with three or four empty squares without generating moves.
+
+    Each empty square is tried directly, in the given order, and is legal if
+    it flips something.
+
+    Args:
+        own (int): Bitboard for the side to move.
+        opp (int): Bitboard for the other side.
+        squares (list): The empty squares as single-bit masks, in parity order.
+        alpha (int): The alpha value for pruning.
+        beta (int): The beta value for pruning.
+        passed (bool): True if the other side has just passed.
+
+    Returns:
+        int: The final disc differential for the side to move.
+    """
+    best = -SCORE_WIN - 1
+    for i, square in enumerate(squares):
+        if not NEIGHBOURS[square] & opp:
+            continue
+        flips = get_flips_bitboard(own, opp, square)
+        if not flips:
+            continue
+        rest = squares[:i] + squares[i + 1:]
+        if len(rest) == 2:
+            score = -solve_2(opp ^ flips, own | square | flips, rest[0], rest[1], -beta, -alpha)
+        else:
+            score = -solve_small(opp ^ flips, own | square | flips, rest, -beta, -alpha)
+        if score > best:
+            best = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    return best
+    if best > -SCORE_WIN - 1:
+        return best
+    if passed:
+        return own.bit_count() - opp.bit_count()
+    return -solve_small(opp, own, squares, -beta, -alpha, True)
+
+def order_moves(own, opp, moves_mask, empty_count, tt_move=0):
+    """
+    Orders the legal moves of an endgame position.
+
+    With many empties, moves are ordered fastest-first: the move that leaves
+    the opponent the fewest replies is tried first. Closer to the end, the
+    cheaper parity ordering is used.
+
+    Args:
+        own (int): Bitboard for the side to move.
+        opp (int): Bitboard for the other side.
+        moves_mask (int): The legal move bitboard.
+        empty_count (int): The number of empty squares.
+        tt_move (int, optional): The table's best move as a single-bit mask, tried first.
+
+    Returns:
+        list: A list of (move_bit, child_own, child_opp) tuples, where the child
+        bitboards are from the point of view of the side to move next.
+    """
+    children = []
+    if empty_count > FASTEST_FIRST_EMPTIES:
+        while moves_mask:
+            move_bit = moves_mask & -moves_mask
+            moves_mask ^= move_bit
+            flips = get_flips_bitboard(own, opp, move_bit)
+            child_own = opp ^ flips
+            child_opp = own | move_bit | flips
+            replies = -1 if move_bit == tt_move else get_valid_moves_bitboard(child_own, child_opp).bit_count()
+            children.append((replies, move_bit, child_own, child_opp))
+        children.sort(key=lambda child: child[0])
+        return [child[1:] for child in children]
+    moves = parity_order(moves_mask, ~(own | opp) & FULL_MASK)
+    if tt_move & moves_mask:
+        moves.remove(tt_move)
+        moves.insert(0, tt_move)
+    for move_bit in moves:
+        flips = get_flips_bitboard(own, opp, move_bit)
+        children.append((move_bit, opp ^ flips, own | move_bit | flips))
+    return children
+
+def solve(own, opp, alpha, beta, control, table, passed=False):
+    """
+    The exact endgame search: Negamax with Alpha-Beta pruning and Principal Variation Search.
+
+    Args:
+        own (int): Bitboard for the side to move.
+        opp (int): Bitboard for the other side.
+        alpha (int): The alpha value for pruning.
+        beta (int): The beta value for pruning.
+        control (SearchControl): Counts the nodes and decides when the search has to stop.
+        table (TranspositionTable): The endgame table to use.
+        passed (bool): True if the other side has just passed.
+
+    Returns:
+        int: The final disc differential for the side to move. Once control.stopped
+        is set the value is meaningless and must be discarded.
+    """
+    empties = ~(own | opp) & FULL_MASK
+    empty_count = empties.bit_count()
+    if empty_count <= 4:
+        squares = parity_order(empties, empties)
+        if empty_count == 4 or empty_count == 3:
+            return solve_small(own, opp, squares, alpha, beta, passed)
+        if empty_count == 2:
+            return solve_2(own, opp, squares[0], squares[1], alpha, beta, passed)
+        if empty_count == 1:
+            return solve_1(own, opp, squares[0])
+        return own.bit_count() - opp.bit_count()
+
+    # The last four empties are not counted: they are solved in bounded time.
+    control.nodes += 1
+    if control.nodes >= control.next_poll and control.poll():
+        return 0
+
+    moves_mask = get_valid_moves_bitboard(own, opp)
+    if moves_mask == 0:
+        if passed:
+            return own.bit_count() - opp.bit_count()
+        return -solve(opp, own, -beta, -alpha, control, table, True)
+
+    alpha_orig = alpha
+    tt_move = 0
+    use_table = empty_count >= TABLE_EMPTIES
+    if use_table:
+        key = hash((own, opp)) & 0xFFFFFFFFFFFFFFFF
+        entry = table.probe(key, own, opp)
+        if entry is not None:
+            value, _, flag, move = entry
+            value = int(value)
+            if move != NO_MOVE:
+                tt_move = 1 << move
+            if flag == EXACT:
+                return value
+            elif flag == LOWERBOUND:
+                alpha = max(alpha, value)
+            elif flag == UPPERBOUND:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+    best = -SCORE_WIN - 1
+    best_move = 0
+    for move_bit, child_own, child_opp in order_moves(own, opp, moves_mask, empty_count, tt_move):
+        if best == -SCORE_WIN - 1:
+            score = -solve(child_own, child_opp, -beta, -alpha, control, table)
+        else:
+            score = -solve(child_own, child_opp, -alpha - 1, -alpha, control, table)
+            if alpha < score < beta and not control.stopped:
+                score = -solve(child_own, child_opp, -beta, -score, control, table)
+        if control.stopped:
+            return 0
+        if score > best:
+            best = score
+            best_move = move_bit
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+
+    if use_table:
+        if best <= alpha_orig:
+            flag = UPPERBOUND
+        elif best >= beta:
+            flag = LOWERBOUND
+        else:
+            flag = EXACT
+        table.store(key, own, opp, best, empty_count, flag, best_move.bit_length() - 1)
+    return best
+
+def solve_endgame(own, opp, control, table, moves_mask=None):
+    """
+    Finds the best move and the exact final disc differential of an endgame position.
+
+    Args:
+        own (int): Bitboard for the current player.
+        opp (int): Bitboard for the opponent.
+        control (SearchControl): Counts the nodes and decides when the search has to stop.
+        table (TranspositionTable): The endgame table to use.
+        moves_mask (int, optional): The legal move bitboard at the root, if already known.
+
+    Returns:
+        tuple: A tuple (score, move_bit) with the final disc differential for the
+        current player under perfect play and the move achieving it, or None if
+        there is no legal move or the search was stopped before the position was solved.
+    """
+    if moves_mask is None:
+        moves_mask = get_valid_moves_bitboard(own, opp)
+    if moves_mask == 0:
+        return None
+
+    empty_count = (~(own | opp) & FULL_MASK).bit_count()
+    table.new_search()
+    alpha = -SCORE_WIN - 1
+    beta = SCORE_WIN + 1
+    best = alpha
+    best_move = 0
+    for move_bit, child_own, child_opp in order_moves(own, opp, moves_mask, empty_count):
+        if best == -SCORE_WIN - 1:
+            score = -solve(child_own, child_opp, -beta, -alpha, control, table)
+        else:
+            score = -solve(child_own, child_opp, -alpha - 1, -alpha, control, table)
+            if score > alpha and not control.stopped:
+                score = -solve(child_own, child_opp, -beta, -score, control, table)
+        if control.stopped:
+            return None
+        if score > best:
+            best = score
+            best_move = move_bit
+            alpha = score
+    return best, best_move
+
+# Win/Loss/Draw Results
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+def solve_wld(own, opp, control, table, moves_mask=None):
+    """
+    Proves the game-theoretic result of an endgame position without its exact margin.
+
+    Each root move is searched with a null window around zero, which only
+    has to decide whether the final disc differential is positive, zero or
+    negative. This prunes far more than an exact solve, so it is affordable
+    with several more empty squares.
+
+    Args:
+        own (int): Bitboard for the current player.
+        opp (int): Bitboard for the opponent.
+        control (SearchControl): Counts the nodes and decides when the search has to stop.
+        table (TranspositionTable): The endgame table to use.
+        moves_mask (int, optional): The legal move bitboard at the root, if already known.
+
+    Returns:
+        tuple: A tuple (result, move_bit) where result is WIN, DRAW or LOSS for the
+        current player under perfect play and move_bit is a move achieving it, or
+        None if there is no legal move or the search was stopped before the result
+        was proven.
+    """
+    if moves_mask is None:
+        moves_mask = get_valid_moves_bitboard(own, opp)
+    if moves_mask == 0:
+        return None
+
+    empty_count = (~(own | opp) & FULL_MASK).bit_count()
+    table.new_search()
+    result = None
+    best_move = 0
+    for move_bit, child_own, child_opp in order_moves(own, opp, moves_mask, empty_count):
+        if result == DRAW:
+            # After a draw only a win can improve on it.
+            score = -solve(child_own, child_opp, -1, 0, control, table)
+        else:
+            # Otherwise decide between win, draw and loss.
+            score = -solve(child_own, child_opp, -1, 1, control, table)
+        if control.stopped:
+            return None
+        if score > 0:
+            return WIN, move_bit
+        if result != DRAW and score == 0:
+            result = DRAW
+            best_move = move_bit
+        elif result is None:
+            result = LOSS
+            best_move = move_bit
+    return result, best_move
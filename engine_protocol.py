@@ -0,0 +1,263 @@
+import sys
+import threading
+from constants import BLACK, WHITE
+from game_logic import Board, TurnState, create_board
+from time_manager import TimeManager
+from search_stats import SearchStats
+from engine_worker import EngineWorker
+from analysis import move_variation
+from ai import Engine
+
+# Characters of the position command's 64 squares, in row-major order from A1.
+BLACK_SQUARES = "Xx*"
+WHITE_SQUARES = "Oo"
+EMPTY_SQUARES = "-."
+
+class ProtocolEngine:
+    """
+    A long-lived engine that reads commands line by line and answers on its output.
+
+    The engine keeps its transposition table, move ordering and opening book
+    between searches, so a GUI or tournament harness pays for them once
+    instead of on every move. Commands:
+
+    - ``newgame``: Starts a new game from the initial position and clears the tables.
+    - ``position startpos [moves M ...]``: Sets the initial position, then plays the moves.
+    - ``position <64 squares> <b|w> [moves M ...]``: Sets a position, squares in
+      row-major order from A1 ("X" Black, "O" White, "-" empty), then the side to move.
+    - ``play M``: Plays a move, e.g. ``c4`` or ``pass``, on the current position.
+    - ``go [time S] [depth N] [nodes N] [remaining S [increment S]]``: Searches the
+      current position for S seconds (2 by default), to a depth, for a number of nodes,
+      or on a game clock with S seconds remaining. Answers ``info ...`` and ``bestmove M``.
+    - ``stop``: Stops the search; it answers with the best move found so far.
+    - ``isready``: Answers ``readyok``.
+    - ``quit``: Stops any search and exits.
+
+    The search runs on a worker thread, so ``stop`` is read while it runs.
+    Malformed commands are answered with ``error <message>``.
+    """
+    def __init__(self, output=sys.stdout):
+        """
+        Initialize the engine at the initial position.
+
+        Args:
+            output (file): Where the answers are written.
+        """
+        self.output = output
+        self._lock = threading.Lock()
+        self.engine = Engine()
+        self._worker = EngineWorker(self.engine)
+        self._future = None
+        self.board = create_board()
+        self.player = BLACK
+
+    def send(self, line):
+        """
+        Writes one answer line. Safe to call from any thread.
+
+        Args:
+            line (str): The answer, without a newline.
+        """
+        with self._lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    @property
+    def searching(self):
+        """bool: True while a search is running."""
+        return self._future is not None and not self._future.done()
+
+    def handle(self, line):
+        """
+        Runs one command.
+
+        Args:
+            line (str): The command line.
+
+        Returns:
+            bool: False if the engine has to exit, True otherwise.
+        """
+        words = line.split()
+        if not words:
+            return True
+        command, args = words[0].lower(), words[1:]
+        if command == "quit":
+            self.close()
+            return False
+        if command == "isready":
+            self.send("readyok")
+        elif command == "stop":
+            self._worker.move_now()
+        elif command in ("newgame", "position", "play", "go"):
+            if self.searching:
+                self.send(f"error {command}: a search is running")
+                return True
+            try:
+                getattr(self, "_" + command)(args)
+            except ValueError as error:
+                self.send(f"error {command}: {error}")
+        else:
+            self.send(f"error unknown command: {command}")
+        return True
+
+    def _newgame(self, args):
+        """Starts a new game with empty tables."""
+        self.engine.new_game()
+        self.board = create_board()
+        self.player = BLACK
+
+    def _position(self, args):
+        """Sets the position and plays the moves that follow it."""
+        if not args:
+            raise ValueError("missing position")
+        if args[0].lower() == "startpos":
+            board, player, rest = create_board(), BLACK, args[1:]
+        else:
+            if len(args) < 2 or len(args[0]) != 64 or args[1].lower() not in ("b", "w"):
+                raise ValueError("expected startpos or 64 squares and b or w")
+            board, player, rest = parse_board(args[0]), BLACK if args[1].lower() == "b" else WHITE, args[2:]
+        if rest and rest[0].lower() != "moves":
+            raise ValueError(f"unexpected {rest[0]}")
+        for move in rest[1:]:
+            board, player = play_move(board, player, move)
+        self.board, self.player = board, player
+
+    def _play(self, args):
+        """Plays one move on the current position."""
+        if len(args) != 1:
+            raise ValueError("expected one move")
+        self.board, self.player = play_move(self.board, self.player, args[0])
+
+    def _go(self, args):
+        """Starts a search of the current position."""
+        limits = {"time": 2.0, "depth": 64, "nodes": None, "remaining": None, "increment": 0.0}
+        if len(args) % 2:
+            raise ValueError("expected limit names and values in pairs")
+        names = args[::2]
+        for name, value in zip(names, args[1::2]):
+            if name not in limits:
+                raise ValueError(f"unknown limit {name}")
+            limits[name] = int(value) if name in ("depth", "nodes") else float(value)
+        # A depth or node limit alone searches without a deadline.
+        if ("depth" in names or "nodes" in names) and "time" not in names:
+            limits["time"] = float('inf')
+        clock = None
+        if limits["remaining"] is not None:
+            clock = TimeManager(limits["remaining"], limits["increment"])
+
+        turn = TurnState(self.board, self.player)
+        stats = SearchStats()
+        self._future = self._worker.submit(self.board, self.player, node_limit=limits["nodes"], turn=turn,
+                                           time_limit=limits["time"], clock=clock, stats=stats,
+                                           max_depth=limits["depth"])
+        self._future.add_done_callback(lambda future: self._report(future, turn, stats))
+
+    def _report(self, future, turn, stats):
+        """
+        Answers a finished search with its statistics and best move.
+
+        Args:
+            future (Future): The finished search.
+            turn (TurnState): The searched position.
+            stats (SearchStats): The statistics of the search.
+        """
+        try:
+            move = future.result()
+        except Exception as error:
+            self.send(f"error go: {error}")
+            return
+        if move is None:
+            self.send("bestmove pass")
+            return
+        move_bit = 1 << (move[0] * 8 + move[1])
+        info = f"info phase {stats.phase}"
+        pv = [move_bit]
+        if stats.iterations:
+            info += f" depth {stats.depth} score {stats.iterations[-1]['score']:.2f}"
+            if stats.phase == "search":
+                pv = move_variation(turn.own, turn.opp, turn.player == BLACK, move_bit, stats.depth, self.engine)
+        nps = round(stats.nodes / stats.time) if stats.time > 0 else 0
+        info += f" nodes {stats.nodes} nps {nps} time {stats.time:.3f} pv {' '.join(format_move(bit) for bit in pv)}"
+        self.send(info)
+        self.send(f"bestmove {format_move(move_bit)}")
+
+    def close(self):
+        """Stops any search and shuts the worker down."""
+        self._worker.close()
+
+def parse_board(squares):
+    """
+    Builds a board from 64 square characters in row-major order from A1.
+
+    Args:
+        squares (str): "X" (or "x", "*") for Black, "O" (or "o") for White, "-" or "." for empty.
+
+    Returns:
+        Board: The board.
+
+    Raises:
+        ValueError: If a character is not a square.
+    """
+    black = white = 0
+    for index, square in enumerate(squares):
+        if square in BLACK_SQUARES:
+            black |= 1 << index
+        elif square in WHITE_SQUARES:
+            white |= 1 << index
+        elif square not in EMPTY_SQUARES:
+            raise ValueError(f"bad square {square!r}")
+    return Board(black, white)
+
+def play_move(board, player, move):
+    """
+    Plays a move given in text.
+
+    Args:
+        board (Board): The current board.
+        player (str): The color of the player to move.
+        move (str): The move as column letter and row number (e.g. "c4"), or "pass".
+
+    Returns:
+        tuple: The board and the player to move after the move.
+
+    Raises:
+        ValueError: If the move is malformed or illegal.
+    """
+    turn = TurnState(board, player)
+    opponent = WHITE if player == BLACK else BLACK
+    if move.lower() == "pass":
+        if turn.has_valid_move:
+            raise ValueError("pass with legal moves")
+        return board, opponent
+    if len(move) != 2 or not move[0].isalpha() or not move[1].isdigit():
+        raise ValueError(f"bad move {move}")
+    row, col = int(move[1]) - 1, ord(move[0].lower()) - ord('a')
+    if not (0 <= row < 8 and 0 <= col < 8 and turn.is_valid_move(row, col)):
+        raise ValueError(f"illegal move {move}")
+    return board.apply_move(row, col, player)[0], opponent
+
+def format_move(move_bit):
+    """
+    Formats a move as column letter and row number.
+
+    Args:
+        move_bit (int): The move as a single-bit mask, or 0 for a pass.
+
+    Returns:
+        str: The move, e.g. "c4", or "pass".
+    """
+    if not move_bit:
+        return "pass"
+    index = move_bit.bit_length() - 1
+    return f"{chr(ord('a') + index % 8)}{index // 8 + 1}"
+
+def main():
+    """Runs the engine on standard input and output until quit or end of input."""
+    engine = ProtocolEngine()
+    for line in sys.stdin:
+        if not engine.handle(line):
+            return
+    engine.close()
+
+if __name__ == "__main__":
+    main()
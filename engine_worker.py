@@ -0,0 +1,74 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ai import default_engine
+from search_control import SearchControl
+
+class EngineWorker:
+    """
+    Runs the AI's searches on a background thread, so the caller stays responsive.
+
+    submit() starts a search and returns a future for its move. While it
+    runs, progress() reports the depth, score and speed of the search, and
+    move_now() stops it early: the future then resolves to the best move
+    found so far.
+
+    Only one search runs at a time, and nothing else may search with the
+    worker's engine (e.g. a Ponderer) until its future is done.
+    """
+    def __init__(self, engine=None):
+        """
+        Initialize the worker and its thread.
+
+        Args:
+            engine (Engine, optional): The engine to search with; the default engine
+                (see ai.default_engine) if not given.
+        """
+        self.engine = engine if engine is not None else default_engine()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine")
+        self._control = None
+        self._start_time = None
+
+    def submit(self, board, player, node_limit=None, **kwargs):
+        """
+        Starts searching for a move.
+
+        Args:
+            board (Board or list): The current game board.
+            player (str): The color of the player to move.
+            node_limit (int, optional): The number of nodes after which the search stops.
+            **kwargs: Further arguments for Engine.get_best_move (e.g. turn, clock, time_limit).
+
+        Returns:
+            Future: Resolves to the result of Engine.get_best_move, the move (row, col) or None.
+        """
+        control = SearchControl(node_limit=node_limit)
+        self._control = control
+        self._start_time = time.time()
+        return self._executor.submit(self.engine.get_best_move, board, player, control=control, **kwargs)
+
+    def move_now(self):
+        """Stops the current search; its future resolves to the best move found so far."""
+        if self._control is not None:
+            self._control.stop()
+
+    def progress(self):
+        """
+        Reports how the current search is going.
+
+        Returns:
+            tuple: A tuple (depth, score, nodes, nodes_per_second), where depth and score
+            are those of the last completed pass (0 and None before the first one),
+            or None if no search has been submitted.
+        """
+        control = self._control
+        if control is None:
+            return None
+        depth, score, _ = control.progress or (0, None, None)
+        nodes = control.nodes
+        elapsed = time.time() - self._start_time
+        return depth, score, nodes, nodes / elapsed if elapsed > 0 else 0.0
+
+    def close(self):
+        """Stops the current search and shuts the thread down."""
+        self.move_now()
+        self._executor.shutdown(wait=True)
@@ -1,19 +1,361 @@
 from constants import BOARD_SIZE, EMPTY, BLACK, WHITE
+from bitboard import get_valid_moves_bitboard, get_flips_bitboard
+
+DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1),
+              (0, -1),           (0, 1),
+              (1, -1),  (1, 0),  (1, 1)]
+
+class Board:
+    """
+    An immutable Othello board backed by two 64-bit bitboards.
+
+    Square (row, col) maps to bit ``row * 8 + col``. The board still behaves
+    like the old 2D list for reading: ``board[row][col]`` returns EMPTY, BLACK
+    or WHITE and iterating yields the rows, so display and legacy code keep
+    working unchanged. Row views are built once and cached.
+    """
+    __slots__ = ('black', 'white', '_rows')
+
+    def __init__(self, black=0, white=0):
+        """
+        Initialize the board from its bitboards.
+
+        Args:
+            black (int): Bitboard of Black's pieces.
+            white (int): Bitboard of White's pieces.
+        """
+        self.black = black
+        self.white = white
+        self._rows = None
+
+    @classmethod
+    def from_list(cls, rows):
+        """
+        Builds a Board from a 2D list representation.
+
+        Args:
+            rows (list): A 2D list of EMPTY, BLACK and WHITE values.
+
+        Returns:
+            Board: The equivalent bitboard-backed board.
+        """
+        black = 0
+        white = 0
+        for r in range(BOARD_SIZE):
+            for c in range(BOARD_SIZE):
+                p = rows[r][c]
+                if p == BLACK:
+                    black |= 1 << (r * 8 + c)
+                elif p == WHITE:
+                    white |= 1 << (r * 8 + c)
+        return cls(black, white)
+
+    def to_list(self):
+        """
+        Returns a mutable 2D list copy of the board.
+
+        Returns:
+            list: A 2D list of EMPTY, BLACK and WHITE values.
+        """
+        return [list(row) for row in self.rows()]
+
+    def rows(self):
+        """
+        Returns the cached read-only list view of the board.
+
+        Returns:
+            list: A list of 8 tuples, one per row.
+        """
+        if self._rows is None:
+            black = self.black
+            white = self.white
+            rows = []
+            for r in range(BOARD_SIZE):
+                row = []
+                for c in range(BOARD_SIZE):
+                    bit = 1 << (r * 8 + c)
+                    if black & bit:
+                        row.append(BLACK)
+                    elif white & bit:
+                        row.append(WHITE)
+                    else:
+                        row.append(EMPTY)
+                rows.append(tuple(row))
+            self._rows = rows
+        return self._rows
+
+    def __getitem__(self, r):
+        return self.rows()[r]
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def __len__(self):
+        return BOARD_SIZE
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.black == other.black and self.white == other.white
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.black, self.white))
+
+    def __repr__(self):
+        return f"Board(black={self.black:#018x}, white={self.white:#018x})"
+
+    def masks(self, player):
+        """
+        Returns the bitboards from the given player's point of view.
+
+        Args:
+            player (str): The color of the player (BLACK or WHITE).
+
+        Returns:
+            tuple: A tuple (own, opp) of bitboards.
+        """
+        if player == BLACK:
+            return self.black, self.white
+        return self.white, self.black
+
+    def valid_moves_mask(self, player):
+        """
+        Returns the bitboard of legal moves for the given player.
+
+        Args:
+            player (str): The color of the player (BLACK or WHITE).
+
+        Returns:
+            int: A bitboard where set bits represent valid move positions.
+        """
+        own, opp = self.masks(player)
+        return get_valid_moves_bitboard(own, opp)
+
+    def is_valid_move(self, row, col, player):
+        """
+        Determines if a move is valid for a given player at a specific location.
+
+        Args:
+            row (int): The row index of the move.
+            col (int): The column index of the move.
+            player (str): The color of the player making the move.
+
+        Returns:
+            bool: True if the move is valid, False otherwise.
+        """
+        return bool((self.valid_moves_mask(player) >> (row * 8 + col)) & 1)
+
+    def get_valid_moves(self, player):
+        """
+        Returns a list of all valid moves for the given player.
+
+        Args:
+            player (str): The color of the player (BLACK or WHITE).
+
+        Returns:
+            list: A list of tuples (row, col) in row-major order.
+        """
+        moves = []
+        mask = self.valid_moves_mask(player)
+        while mask:
+            lsb = mask & -mask
+            idx = lsb.bit_length() - 1
+            moves.append((idx // 8, idx % 8))
+            mask ^= lsb
+        return moves
+
+    def has_valid_move(self, player):
+        """
+        Checks if the player has at least one valid move.
+
+        Args:
+            player (str): The color of the player.
+
+        Returns:
+            bool: True if the player has a valid move, False otherwise.
+        """
+        return self.valid_moves_mask(player) != 0
+
+    def apply_move(self, row, col, player):
+        """
+        Applies a move and returns the resulting board.
+
+        Args:
+            row (int): The row index of the move.
+            col (int): The column index of the move.
+            player (str): The color of the player making the move.
+
+        Returns:
+            tuple: A tuple containing:
+                - new_board (Board): The new board state after the move.
+                - flipped_groups (list): A list of lists, where each inner list contains the coordinates of pieces flipped in a particular direction, ordered outwards from the move.
+        """
+        own, opp = self.masks(player)
+        move = 1 << (row * 8 + col)
+        flips = get_flips_bitboard(own, opp, move)
+        new_own = own | move | flips
+        new_opp = opp & ~flips
+
+        flipped_groups = []
+        if flips:
+            for dr, dc in DIRECTIONS:
+                r, c = row + dr, col + dc
+                to_flip = []
+                while is_on_board(r, c) and flips >> (r * 8 + c) & 1:
+                    to_flip.append((r, c))
+                    r += dr
+                    c += dc
+                if to_flip:
+                    flipped_groups.append(to_flip)
+
+        if player == BLACK:
+            return Board(new_own, new_opp), flipped_groups
+        return Board(new_opp, new_own), flipped_groups
+
+    def is_game_over(self):
+        """
+        Checks if the game is over (i.e., neither player can move).
+
+        Returns:
+            bool: True if the game is over, False otherwise.
+        """
+        return (get_valid_moves_bitboard(self.black, self.white) == 0
+                and get_valid_moves_bitboard(self.white, self.black) == 0)
+
+    def get_score(self):
+        """
+        Calculates the current score for both players.
+
+        Returns:
+            tuple: A tuple (black_score, white_score).
+        """
+        return self.black.bit_count(), self.white.bit_count()
+
+    def empty_count(self):
+        """
+        Returns the number of empty squares.
+
+        Returns:
+            int: The number of empty squares on the board.
+        """
+        return 64 - (self.black | self.white).bit_count()
+
+class TurnState:
+    """
+    Legal-move information for one ply, computed once and shared.
+
+    The game loop, the human input validator and the engine all need the
+    same facts about the side to move: its legal moves, whether it has to
+    pass and whether the game is over. A TurnState computes the side to
+    move's move mask once on construction; the opponent's mask is only
+    computed when the side to move has no moves, which is the only time it
+    decides anything.
+    """
+    __slots__ = ('board', 'player', 'own', 'opp', 'moves_mask', '_opp_moves_mask', '_valid_moves')
+
+    def __init__(self, board, player, moves_mask=None):
+        """
+        Initialize the turn state.
+
+        Args:
+            board (Board or list): The current game board.
+            player (str): The color of the player to move.
+            moves_mask (int, optional): The player's legal move bitboard, if already known.
+        """
+        self.board = _as_board(board)
+        self.player = player
+        self.own, self.opp = self.board.masks(player)
+        if moves_mask is None:
+            moves_mask = get_valid_moves_bitboard(self.own, self.opp)
+        self.moves_mask = moves_mask
+        self._opp_moves_mask = None
+        self._valid_moves = None
+
+    @property
+    def opp_moves_mask(self):
+        """int: The opponent's legal move bitboard, computed on first use."""
+        if self._opp_moves_mask is None:
+            self._opp_moves_mask = get_valid_moves_bitboard(self.opp, self.own)
+        return self._opp_moves_mask
+
+    @property
+    def valid_moves(self):
+        """list: The legal moves as (row, col) tuples in row-major order."""
+        if self._valid_moves is None:
+            moves = []
+            mask = self.moves_mask
+            while mask:
+                lsb = mask & -mask
+                idx = lsb.bit_length() - 1
+                moves.append((idx // 8, idx % 8))
+                mask ^= lsb
+            self._valid_moves = moves
+        return self._valid_moves
+
+    @property
+    def has_valid_move(self):
+        """bool: True if the player to move has at least one legal move."""
+        return self.moves_mask != 0
+
+    @property
+    def is_game_over(self):
+        """bool: True if neither player can move."""
+        return self.moves_mask == 0 and self.opp_moves_mask == 0
+
+    @property
+    def must_pass(self):
+        """bool: True if the player to move has no move but the opponent does."""
+        return self.moves_mask == 0 and self.opp_moves_mask != 0
+
+    def is_valid_move(self, row, col):
+        """
+        Checks a move against the precomputed legal move mask.
+
+        Args:
+            row (int): The row index of the move.
+            col (int): The column index of the move.
+
+        Returns:
+            bool: True if the move is valid, False otherwise.
+        """
+        return bool((self.moves_mask >> (row * 8 + col)) & 1)
+
+    def after_pass(self):
+        """
+        Returns the turn state for the opponent after the player to move passes.
+
+        Returns:
+            TurnState: The opponent's turn state on the same board, reusing the
+            already computed opponent move mask.
+        """
+        opponent = WHITE if self.player == BLACK else BLACK
+        return TurnState(self.board, opponent, self.opp_moves_mask)
+
+def _as_board(board):
+    """
+    Returns the board as a Board, converting 2D lists from legacy callers.
+
+    Args:
+        board (Board or list): The game board.
+
+    Returns:
+        Board: The bitboard-backed board.
+    """
+    if isinstance(board, Board):
+        return board
+    return Board.from_list(board)
 
 def create_board():
     """
     Creates and initializes the game board.
 
     Returns:
-        list: A 2D list representing the 8x8 Othello board with the initial four pieces placed in the center.
+        Board: An 8x8 Othello board with the initial four pieces placed in the center.
     """
-    board = [[EMPTY for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
     mid = BOARD_SIZE // 2
-    board[mid-1][mid-1] = WHITE
-    board[mid][mid] = WHITE
-    board[mid-1][mid] = BLACK
-    board[mid][mid-1] = BLACK
-    return board
+    white = (1 << ((mid - 1) * 8 + mid - 1)) | (1 << (mid * 8 + mid))
+    black = (1 << ((mid - 1) * 8 + mid)) | (1 << (mid * 8 + mid - 1))
+    return Board(black, white)
 
 def is_on_board(r, c):
     """
@@ -37,7 +379,7 @@ def is_valid_move(board, row, col, player):
     2. It outflanks at least one opponent piece in any of the 8 directions.
 
     Args:
-        board (list): The current game board.
+        board (Board or list): The current game board.
         row (int): The row index of the move.
         col (int): The column index of the move.
         player (str): The color of the player making the move (BLACK or WHITE).
@@ -45,132 +387,81 @@ def is_valid_move(board, row, col, player):
     Returns:
         bool: True if the move is valid, False otherwise.
     """
-    if board[row][col] != EMPTY:
-        return False
-    
-    opponent = WHITE if player == BLACK else BLACK
-    
-    directions = [(-1, -1), (-1, 0), (-1, 1),
-                  (0, -1),           (0, 1),
-                  (1, -1),  (1, 0),  (1, 1)]
-    
-    for dr, dc in directions:
-        r, c = row + dr, col + dc
-        if is_on_board(r, c) and board[r][c] == opponent:
-            r += dr
-            c += dc
-            while is_on_board(r, c):
-                if board[r][c] == player:
-                    return True
-                if board[r][c] == EMPTY:
-                    break
-                r += dr
-                c += dc
-            
-    return False
+    return _as_board(board).is_valid_move(row, col, player)
 
 def get_valid_moves(board, player):
     """
     Returns a list of all valid moves for the given player.
 
     Args:
-        board (list): The current game board.
+        board (Board or list): The current game board.
         player (str): The color of the player (BLACK or WHITE).
 
     Returns:
         list: A list of tuples (row, col) representing valid move coordinates.
     """
-    moves = []
-    for r in range(BOARD_SIZE):
-        for c in range(BOARD_SIZE):
-            if is_valid_move(board, r, c, player):
-                moves.append((r, c))
-    return moves
+    return _as_board(board).get_valid_moves(player)
 
 def apply_move(board, row, col, player):
     """
     Applies a move to the board and flips the captured pieces.
 
     Args:
-        board (list): The current game board.
+        board (Board or list): The current game board.
         row (int): The row index of the move.
         col (int): The column index of the move.
         player (str): The color of the player making the move.
 
     Returns:
         tuple: A tuple containing:
-            - new_board (list): The new board state after the move.
+            - new_board (Board): The new board state after the move.
             - flipped_groups (list): A list of lists, where each inner list contains the coordinates of pieces flipped in a particular direction.
     """
-    new_board = [row[:] for row in board]
-    new_board[row][col] = player
-    opponent = WHITE if player == BLACK else BLACK
-    directions = [(-1, -1), (-1, 0), (-1, 1),
-                  (0, -1),           (0, 1),
-                  (1, -1),  (1, 0),  (1, 1)]
-    
-    flipped_groups = []
-                  
-    for dr, dc in directions:
-        r, c = row + dr, col + dc
-        to_flip = []
-        while is_on_board(r, c) and new_board[r][c] == opponent:
-            to_flip.append((r, c))
-            r += dr
-            c += dc
-        if is_on_board(r, c) and new_board[r][c] == player:
-            if to_flip:
-                flipped_groups.append(to_flip)
-                for fr, fc in to_flip:
-                    new_board[fr][fc] = player
-                
-    return new_board, flipped_groups
+    return _as_board(board).apply_move(row, col, player)
 
 def has_valid_move(board, player):
     """
     Checks if the player has at least one valid move.
 
     Args:
-        board (list): The current game board.
+        board (Board or list): The current game board.
         player (str): The color of the player.
 
     Returns:
         bool: True if the player has a valid move, False otherwise.
     """
-    return len(get_valid_moves(board, player)) > 0
+    return _as_board(board).has_valid_move(player)
 
 def is_game_over(board):
     """
     Checks if the game is over (i.e., neither player can move).
 
     Args:
-        board (list): The current game board.
+        board (Board or list): The current game board.
 
     Returns:
         bool: True if the game is over, False otherwise.
     """
-    return not has_valid_move(board, BLACK) and not has_valid_move(board, WHITE)
+    return _as_board(board).is_game_over()
 
 def get_score(board):
     """
     Calculates the current score for both players.
 
     Args:
-        board (list): The current game board.
+        board (Board or list): The current game board.
 
     Returns:
         tuple: A tuple (black_score, white_score).
     """
-    black_score = sum(row.count(BLACK) for row in board)
-    white_score = sum(row.count(WHITE) for row in board)
-    return black_score, white_score
+    return _as_board(board).get_score()
 
 def get_winner(board):
     """
     Determines the winner of the game.
 
     Args:
-        board (list): The current game board.
+        board (Board or list): The current game board.
 
     Returns:
         str: The color of the winner (BLACK or WHITE), or EMPTY if it's a tie.
@@ -0,0 +1,372 @@
+import argparse
+import asyncio
+import itertools
+import os
+import signal
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from constants import BLACK, WHITE
+from game_logic import Board, TurnState, create_board
+from time_manager import TimeManager, DEFAULT_GAME_TIME, DEFAULT_INCREMENT
+from engine_protocol import play_move, format_move
+from ai import Engine
+
+DEFAULT_PORT = 7777
+DEFAULT_MAX_GAMES = 256
+
+# Engine requests allowed in flight per worker process, queued ones included.
+# Past this, games wait for a slot before their request is submitted and
+# stop reading from their connections until they get one.
+QUEUE_DEPTH = 2
+
+# Every game is played by one worker process, which keeps the engines of
+# this many recent games, each with a transposition table of this size
+# (plus its endgame table), so a game's tables stay warm between its moves.
+# Older games' engines are reused for new ones.
+ENGINES_PER_WORKER = 8
+ENGINE_TT_SIZE_MB = 8
+
+# The engines of a worker process by game id, least recently used first.
+_engines = OrderedDict()
+
+class EngineFailure(Exception):
+    """Raised when the engine could not find the computer's move."""
+
+class Game:
+    """
+    The state of one game between a client and the computer.
+
+    Attributes:
+        board (Board): The current board.
+        player (str): The color of the player to move.
+        client (str): The client's color.
+        clock (TimeManager): The computer's game clock.
+        id (int): The game's id on the server, once it has one.
+        worker (int): The index of the worker process that plays the computer's moves.
+    """
+    def __init__(self, client, total_time, increment):
+        """
+        Initialize a game at the initial position.
+
+        Args:
+            client (str): The client's color; Black moves first.
+            total_time (float): Seconds on the computer's clock.
+            increment (float): Seconds added to the computer's clock after every move.
+        """
+        self.board = create_board()
+        self.player = BLACK
+        self.client = client
+        self.clock = TimeManager(total_time, increment)
+        self.id = None
+        self.worker = None
+
+    @property
+    def turn(self):
+        """TurnState: The state of the current turn."""
+        return TurnState(self.board, self.player)
+
+    def play(self, move):
+        """
+        Plays a move for the player to move.
+
+        Args:
+            move (str): The move as column letter and row number, or "pass".
+
+        Raises:
+            ValueError: If the move is malformed or illegal.
+        """
+        self.board, self.player = play_move(self.board, self.player, move)
+
+def engine_move(game_id, black, white, player, clock):
+    """
+    Finds the computer's move in a worker process.
+
+    Each game gets its own engine in the worker (see get_engine), so its
+    tables stay warm between its moves and are never shared with other games.
+
+    Args:
+        game_id (int): The game's id on the server.
+        black (int): Bitboard of Black's pieces.
+        white (int): Bitboard of White's pieces.
+        player (str): The color of the player to move.
+        clock (TimeManager): The computer's game clock, running since the move was
+            requested, so the time spent waiting for the worker comes off the budget.
+
+    Returns:
+        tuple: The move (row, col), or None to pass.
+    """
+    return get_engine(game_id).get_best_move(Board(black, white), player, clock=clock)
+
+def get_engine(game_id):
+    """
+    Returns this worker process's engine for a game, creating one if needed.
+
+    Once ENGINES_PER_WORKER games have engines, the least recently used
+    one is cleared and handed to the new game.
+
+    Args:
+        game_id (int): The game's id on the server.
+
+    Returns:
+        Engine: The game's engine.
+    """
+    engine = _engines.pop(game_id, None)
+    if engine is None:
+        if len(_engines) >= ENGINES_PER_WORKER:
+            engine = _engines.popitem(last=False)[1]
+            engine.new_game()
+        else:
+            engine = Engine(ENGINE_TT_SIZE_MB)
+    _engines[game_id] = engine
+    return engine
+
+class GameServer:
+    """
+    Hosts many games at once on an asyncio socket server.
+
+    Every connection plays one game. The client sends ``new <b|w> [time S]
+    [increment S]`` to start a game as Black or White, then ``move <move>``
+    (e.g. ``move c4``), and ``quit`` to leave. The server answers every
+    computer move with ``move <move>`` (``move pass`` when the computer has
+    to pass), passes for the client automatically, and ends each exchange
+    with ``turn <legal moves>`` or ``gameover <black discs> <white discs>``.
+    Malformed or illegal input is answered with ``error <message>``. If the
+    engine fails, the server answers ``error engine failure`` and ends the
+    game; the client may start a new one.
+
+    The engine runs in a fixed set of worker processes that stay warm
+    between requests. Every game is bound to one worker, the one with the
+    fewest games when it starts, which keeps the game's engine between
+    moves. At most QUEUE_DEPTH requests per worker are in flight; other
+    games wait for a slot, and meanwhile stop reading from their
+    connections, so a busy server slows its clients down instead of
+    queueing without bound. Each game's computer plays on its own clock,
+    which runs from the moment the move is requested, so waiting for a
+    busy worker is charged to the game.
+    """
+    def __init__(self, workers=None, max_games=DEFAULT_MAX_GAMES):
+        """
+        Initialize the server and start its engine workers.
+
+        Args:
+            workers (int, optional): The number of engine processes; the number of cores by default.
+            max_games (int): The number of games hosted at once; further clients are refused.
+        """
+        self.workers = workers or os.cpu_count()
+        self.max_games = max_games
+        self.games = {}
+        self._ids = itertools.count(1)
+        # One single-process executor per worker, so a game's requests always
+        # reach the worker holding its engine.
+        self._pools = [ProcessPoolExecutor(1) for _ in range(self.workers)]
+        # Start the workers now, before the server opens its socket, so that
+        # they neither inherit it nor delay the first games.
+        for pool in self._pools:
+            pool.submit(int).result()
+        self._slots = [asyncio.Semaphore(QUEUE_DEPTH) for _ in range(self.workers)]
+
+    async def handle(self, reader, writer):
+        """
+        Serves one connection.
+
+        Args:
+            reader (StreamReader): The client's input.
+            writer (StreamWriter): The client's output.
+        """
+        game_id = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                words = line.decode().split()
+                if not words:
+                    continue
+                command, args = words[0].lower(), words[1:]
+                if command == "quit":
+                    break
+                try:
+                    if command == "new":
+                        if game_id is None and len(self.games) >= self.max_games:
+                            raise ValueError("server full")
+                        game = new_game(args)
+                        # A new game gets a new id, and so new engines.
+                        self.games.pop(game_id, None)
+                        game_id = next(self._ids)
+                        game.id = game_id
+                        game.worker = self.least_loaded_worker()
+                        self.games[game_id] = game
+                        writer.write(f"ok {game_id}\n".encode())
+                        await self.advance(game, writer)
+                    elif command == "move":
+                        if game_id is None:
+                            raise ValueError("no game")
+                        if len(args) != 1:
+                            raise ValueError("expected one move")
+                        game = self.games[game_id]
+                        if game.player != game.client or game.turn.is_game_over:
+                            raise ValueError("not your turn")
+                        game.play(args[0])
+                        await self.advance(game, writer)
+                    else:
+                        raise ValueError(f"unknown command: {command}")
+                except ValueError as error:
+                    writer.write(f"error {error}\n".encode())
+                except EngineFailure:
+                    writer.write(b"error engine failure\n")
+                    self.games.pop(game_id, None)
+                    game_id = None
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.games.pop(game_id, None)
+            writer.close()
+
+    async def advance(self, game, writer):
+        """
+        Plays the computer's moves and the client's passes until the client has to move.
+
+        Args:
+            game (Game): The game.
+            writer (StreamWriter): The client's output.
+
+        Raises:
+            EngineFailure: If the worker failed to find the computer's move.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            turn = game.turn
+            if turn.is_game_over:
+                black, white = game.board.get_score()
+                writer.write(f"gameover {black} {white}\n".encode())
+                return
+            if game.player == game.client:
+                if turn.has_valid_move:
+                    moves = " ".join(f"{chr(ord('a') + col)}{row + 1}" for row, col in turn.valid_moves)
+                    writer.write(f"turn {moves}\n".encode())
+                    return
+                game.play("pass")
+                continue
+            if not turn.has_valid_move:
+                game.play("pass")
+                writer.write(b"move pass\n")
+                continue
+            game.clock.start_move()
+            try:
+                async with self._slots[game.worker]:
+                    pool = self._pools[game.worker]
+                    move = await loop.run_in_executor(pool, engine_move, game.id,
+                                                      game.board.black, game.board.white, game.player, game.clock)
+            except Exception as error:
+                if isinstance(error, BrokenProcessPool):
+                    self.replace_worker(game.worker, pool)
+                raise EngineFailure() from error
+            finally:
+                game.clock.end_move()
+            text = format_move(1 << (move[0] * 8 + move[1]))
+            game.play(text)
+            writer.write(f"move {text}\n".encode())
+
+    def replace_worker(self, worker, pool):
+        """
+        Replaces a worker process that died, so its games can go on.
+
+        The games bound to it lose their warm engines. The new process is
+        started while the server's sockets are open and inherits them, but
+        never uses them.
+
+        Args:
+            worker (int): The index of the worker.
+            pool (ProcessPoolExecutor): The broken executor; nothing is done if it
+                has already been replaced.
+        """
+        if self._pools[worker] is pool:
+            pool.shutdown(wait=False)
+            self._pools[worker] = ProcessPoolExecutor(1)
+
+    def least_loaded_worker(self):
+        """
+        Picks the worker for a new game.
+
+        Returns:
+            int: The index of the worker playing the fewest games.
+        """
+        loads = [0] * self.workers
+        for game in self.games.values():
+            loads[game.worker] += 1
+        return loads.index(min(loads))
+
+    def close(self):
+        """Shuts the engine workers down."""
+        for pool in self._pools:
+            pool.shutdown(cancel_futures=True)
+
+def new_game(args):
+    """
+    Creates a game from the arguments of a new command.
+
+    Args:
+        args (list): The client's color ("b" or "w"), then optional pairs
+            "time S" and "increment S" for the computer's clock.
+
+    Returns:
+        Game: The new game.
+
+    Raises:
+        ValueError: If the arguments are malformed.
+    """
+    if not args or args[0].lower() not in ("b", "w"):
+        raise ValueError("expected b or w")
+    options = {"time": DEFAULT_GAME_TIME, "increment": DEFAULT_INCREMENT}
+    if len(args[1:]) % 2:
+        raise ValueError("expected option names and values in pairs")
+    for name, value in zip(args[1::2], args[2::2]):
+        if name not in options:
+            raise ValueError(f"unknown option {name}")
+        options[name] = float(value)
+    return Game(BLACK if args[0].lower() == "b" else WHITE, options["time"], options["increment"])
+
+async def serve(server, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+    """
+    Runs the server until it is cancelled or receives SIGTERM.
+
+    Args:
+        server (GameServer): The server.
+        host (str): The address to listen on.
+        port (int): The TCP port to listen on.
+        path (str, optional): A Unix socket path to listen on instead of TCP.
+    """
+    if path is not None:
+        listener = await asyncio.start_unix_server(server.handle, path)
+    else:
+        listener = await asyncio.start_server(server.handle, host, port)
+    task = asyncio.current_task()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+    async with listener:
+        try:
+            await listener.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+def main():
+    """Parses the command line and runs the server."""
+    parser = argparse.ArgumentParser(description="Hosts Othello games against the computer over a socket.")
+    parser.add_argument("--host", default="127.0.0.1", help="The address to listen on.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="The TCP port to listen on.")
+    parser.add_argument("--unix", help="A Unix socket path to listen on instead of TCP.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="The number of engine processes.")
+    parser.add_argument("--max-games", type=int, default=DEFAULT_MAX_GAMES, help="The number of games hosted at once.")
+    args = parser.parse_args()
+
+    server = GameServer(args.workers, args.max_games)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
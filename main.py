@@ -1,9 +1,14 @@
 import time
 from constants import BLACK, WHITE, EMPTY, BLACK_COLOR, WHITE_COLOR, RESET_COLOR
-from game_logic import create_board, is_game_over, get_winner, get_score, has_valid_move, apply_move
-from ui import print_board, print_score, print_message, clear_screen, print_welcome, animate_flip
+from game_logic import create_board, get_winner, get_score, apply_move, TurnState
+from ui import print_board, print_score, print_message, clear_screen, print_welcome, animate_flip, print_progress, wait_for_enter
 from player import get_human_move
-from ai import get_best_move
+from engine_worker import EngineWorker
+from time_manager import TimeManager
+from ponder import Ponderer
+
+# Seconds between two updates of the computer's progress line.
+PROGRESS_INTERVAL = 0.25
 
 def main():
     """
@@ -26,8 +31,16 @@ def main():
     board = create_board()
     current_player = BLACK
     last_move_msg = ""
+    turn = TurnState(board, current_player)
+    # The computer plays on a game clock instead of a fixed time per move.
+    computer_clock = TimeManager()
+    # The computer keeps searching while the player thinks.
+    ponderer = Ponderer()
+    # The computer searches on a worker thread so that the console can show
+    # its progress and take the move-now key.
+    engine = EngineWorker()
     
-    while not is_game_over(board):
+    while not turn.is_game_over:
         clear_screen()
         print_board(board)
         black_score, white_score = get_score(board)
@@ -36,7 +49,7 @@ def main():
             print_message(last_move_msg)
             print()
         
-        if not has_valid_move(board, current_player):
+        if turn.must_pass:
             if mode == 1:
                 p_name = f"Player 1 ({BLACK_COLOR}Black{RESET_COLOR})" if current_player == BLACK else f"Player 2 ({WHITE_COLOR}White{RESET_COLOR})"
             else:
@@ -44,7 +57,8 @@ def main():
             
             print_message(f"{p_name} has no valid moves. Skipping turn.")
             time.sleep(2)
-            current_player = WHITE if current_player == BLACK else BLACK
+            turn = turn.after_pass()
+            current_player = turn.player
             continue
             
         if mode == 1:
@@ -61,33 +75,46 @@ def main():
         print_message(msg)
         
         if mode == 1:
-            row, col = get_human_move(board, current_player)
+            row, col = get_human_move(board, current_player, turn)
             col_char = chr(ord('A') + col)
             row_num = row + 1
             p_num = "1" if current_player == BLACK else "2"
             last_move_msg = f"Player {p_num} played: {col_char}{row_num}"
         else:
             if current_player == BLACK:
-                row, col = get_human_move(board, current_player)
+                ponderer.start(turn)
+                row, col = get_human_move(board, current_player, turn)
+                ponderer.stop()
                 col_char = chr(ord('A') + col)
                 row_num = row + 1
                 last_move_msg = f"Player played: {col_char}{row_num}"
             else:
-                print_message("Computer is thinking...")
-                move = get_best_move(board, current_player)
+                print_message("Computer is thinking... (press Enter to move now)")
+                computer_clock.start_move()
+                future = engine.submit(board, current_player, turn=turn, clock=computer_clock)
+                while not future.done():
+                    print_progress(engine.progress())
+                    if wait_for_enter(PROGRESS_INTERVAL):
+                        engine.move_now()
+                print()
+                move = future.result()
+                computer_clock.end_move()
                 if move:
                     row, col = move
                     col_char = chr(ord('A') + col)
                     row_num = row + 1
                     last_move_msg = f"Computer played: {col_char}{row_num}"
                 else:
-                    current_player = WHITE if current_player == BLACK else BLACK
+                    turn = turn.after_pass()
+                    current_player = turn.player
                     continue
                     
         board, flipped_groups = apply_move(board, row, col, current_player)
         animate_flip(flipped_groups, current_player, (row, col))
         current_player = WHITE if current_player == BLACK else BLACK
+        turn = TurnState(board, current_player)
         
+    engine.close()
     clear_screen()
     print_board(board)
     black_score, white_score = get_score(board)
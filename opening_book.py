@@ -1,17 +1,51 @@
-from game_logic import create_board, apply_move
-from constants import BLACK, WHITE, BOARD_SIZE
+import mmap
+import os
+import struct
+from game_logic import Board, create_board
+from constants import BLACK, WHITE
+from bitboard import get_valid_moves_bitboard, get_flips_bitboard
+from symmetry import canonical, transform_move, restore_move
+
+# Compiled Book Format
+# A header (magic, record count) followed by fixed-width records
+# (own, opp, move, score) sorted by (own, opp), so a position is found by
+# binary search straight in the memory-mapped file without loading it.
+# Positions are in their canonical orientation (see symmetry.py), the move
+# is its square index in that orientation, and the score is the line's
+# final disc differential for the side to move (0 when the line has none).
+BOOK_MAGIC = b"OTHBOOK1"
+HEADER = struct.Struct("<8sQ")
+RECORD = struct.Struct("<QQBxh")
+KEY = struct.Struct("<QQ")
+
+# The compiled book used when one has been built (see main); otherwise the
+# built-in lines are compiled in memory on first use.
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+# Standard opening lines as (row, col) moves from the initial position.
+BOOK_LINES = [
+    [(4, 5), (5, 3), (2, 2), (2, 3), (3, 2), (3, 5)],
+    [(4, 5), (5, 5), (5, 4), (3, 5), (2, 4)],
+    [(4, 5), (5, 3), (3, 2), (2, 3)],
+    [(2, 3), (4, 2), (5, 3)],
+    [(3, 2), (2, 4), (4, 5)],
+    [(5, 4), (3, 5), (2, 4)],
+]
 
 def board_to_bitboards(board, player):
     """
     Converts the board to bitboards for the opening book key generation.
 
     Args:
-        board (list): The 2D list representation of the board.
+        board (Board or list): The game board, either a Board or its 2D list representation.
         player (str): The current player's color.
 
     Returns:
         tuple: A tuple (own, opp) of bitboards.
     """
+    if isinstance(board, Board):
+        return board.masks(player)
+
     own = 0
     opp = 0
     opponent = WHITE if player == BLACK else BLACK
@@ -27,44 +61,85 @@ def board_to_bitboards(board, player):
 class OpeningBook:
     """
     Manages the opening book for the Othello AI.
-    
+
     Stores a collection of pre-calculated opening sequences to allow the AI
     to play instantly and optimally during the early game.
-    """
-    def __init__(self):
-        """Initialize the OpeningBook and load sequences."""
-        self.book = {}
-        self._initialize_book()
 
-    def _add_sequence(self, moves):
+    Positions are stored in their canonical orientation (see symmetry.py),
+    so every line also covers its seven rotated and mirrored versions, and
+    a line added in several orientations is stored once.
+
+    Nothing is loaded until the first lookup, which maps the compiled book
+    file into memory if there is one, or compiles the built-in lines. Lookups
+    binary-search the records, so the book's size only costs disk space.
+    """
+    def __init__(self, path=DEFAULT_BOOK_PATH):
         """
-        Adds a sequence of moves to the opening book.
+        Initialize the OpeningBook without loading it.
 
         Args:
-            moves (list): A list of (row, col) tuples representing the move sequence.
+            path (str): The compiled book file, used if it exists.
         """
-        board = create_board()
-        player = BLACK
-        
-        for r, c in moves:
-            own, opp = board_to_bitboards(board, player)
-            
-            if (own, opp) not in self.book:
-                self.book[(own, opp)] = (r, c)
-            
-            board, _ = apply_move(board, r, c, player)
-            player = WHITE if player == BLACK else BLACK
-
-    def _initialize_book(self):
+        self.path = path
+        self._data = None
+        self._count = 0
+        self._file = None
+
+    def _load(self):
         """
-        Populates the book with standard Othello opening lines.
+        Maps the compiled book into memory, or compiles the built-in lines if there is no file.
+
+        Raises:
+            ValueError: If the file is not a compiled book.
         """
-        self._add_sequence([(4, 5), (5, 3), (2, 2), (2, 3), (3, 2), (3, 5)])
-        self._add_sequence([(4, 5), (5, 5), (5, 4), (3, 5), (2, 4)])
-        self._add_sequence([(4, 5), (5, 3), (3, 2), (2, 3)])
-        self._add_sequence([(2, 3), (4, 2), (5, 3)])
-        self._add_sequence([(3, 2), (2, 4), (4, 5)])
-        self._add_sequence([(5, 4), (3, 5), (4, 2)])
+        if os.path.exists(self.path):
+            self._file = open(self.path, "rb")
+            data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = compile_book(collect_positions(BOOK_LINES))
+        magic, count = HEADER.unpack_from(data)
+        if magic != BOOK_MAGIC or len(data) != HEADER.size + count * RECORD.size:
+            raise ValueError(f"{self.path} is not a compiled opening book")
+        self._count = count
+        self._data = data
+
+    def __len__(self):
+        """int: The number of positions in the book."""
+        if self._data is None:
+            self._load()
+        return self._count
+
+    def probe(self, own, opp):
+        """
+        Looks up a position.
+
+        Args:
+            own (int): Bitboard for the side to move.
+            opp (int): Bitboard for the other side.
+
+        Returns:
+            tuple or None: A tuple (move_bit, score) with the book move as a single-bit mask
+            and its score for the side to move, or None if the position is not in the book.
+        """
+        if self._data is None:
+            self._load()
+        own, opp, symmetry = canonical(own, opp)
+        key = own << 64 | opp
+        data = self._data
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            offset = HEADER.size + mid * RECORD.size
+            record_own, record_opp = KEY.unpack_from(data, offset)
+            record_key = record_own << 64 | record_opp
+            if record_key < key:
+                low = mid + 1
+            elif record_key > key:
+                high = mid
+            else:
+                _, _, move, score = RECORD.unpack_from(data, offset)
+                return restore_move(1 << move, symmetry), score
+        return None
 
     def get_move(self, board, player):
         """
@@ -77,8 +152,141 @@ class OpeningBook:
         Returns:
             tuple or None: The (row, col) of the move, or None if not found.
         """
-        own, opp = board_to_bitboards(board, player)
-        return self.book.get((own, opp))
+        entry = self.probe(*board_to_bitboards(board, player))
+        if entry is None:
+            return None
+        return divmod(entry[0].bit_length() - 1, 8)
+
+    def close(self):
+        """Unmaps the book; the next lookup loads it again."""
+        if self._file is not None:
+            self._data.close()
+            self._file.close()
+            self._file = None
+        self._data = None
+
+def parse_line(text):
+    """
+    Parses a line of a text book.
+
+    Args:
+        text (str): Moves as column letter and row number, with or without spaces
+            (e.g. "f5 d6 c3" or "f5d6c3"), optionally followed by the final disc
+            differential for Black (e.g. "f5d6c3 -2").
+
+    Returns:
+        tuple: A tuple (moves, score) with the moves as (row, col) coordinates and the
+        score, or None if the line has none.
+
+    Raises:
+        ValueError: If the line is malformed.
+    """
+    words = text.split()
+    score = None
+    if words and words[-1].lstrip("+-").isdigit():
+        score = int(words.pop())
+    moves_text = "".join(words).lower()
+    if len(moves_text) % 2:
+        raise ValueError(f"bad moves {moves_text!r}")
+    moves = []
+    for i in range(0, len(moves_text), 2):
+        col, row = moves_text[i], moves_text[i + 1]
+        if not ("a" <= col <= "h" and "1" <= row <= "8"):
+            raise ValueError(f"bad move {moves_text[i:i + 2]!r}")
+        moves.append((int(row) - 1, ord(col) - ord("a")))
+    return moves, score
+
+def collect_positions(lines, positions=None):
+    """
+    Plays book lines from the initial position and collects the move played in every position.
+
+    A position reached by several lines keeps the move of the first one.
+
+    Args:
+        lines (iterable): Lines as lists of (row, col) moves, or tuples (moves, score)
+            as returned by parse_line.
+        positions (dict, optional): Collected positions to add to.
+
+    Returns:
+        dict: Maps each canonical position, packed as own << 64 | opp, to a tuple
+        (move, score) with the move's square index in that orientation.
+
+    Raises:
+        ValueError: If a line plays an illegal move.
+    """
+    if positions is None:
+        positions = {}
+    start_own, start_opp = create_board().masks(BLACK)
+    for line in lines:
+        moves, score = line if isinstance(line, tuple) else (line, None)
+        own, opp, black_to_move = start_own, start_opp, True
+        for row, col in moves:
+            move_bit = 1 << (row * 8 + col)
+            if not get_valid_moves_bitboard(own, opp):
+                # The side to move has to pass; lines do not spell passes out.
+                own, opp, black_to_move = opp, own, not black_to_move
+            if not get_valid_moves_bitboard(own, opp) & move_bit:
+                raise ValueError(f"illegal move {chr(ord('a') + col)}{row + 1}")
+            canonical_own, canonical_opp, symmetry = canonical(own, opp)
+            key = canonical_own << 64 | canonical_opp
+            if key not in positions:
+                mover_score = 0 if score is None else (score if black_to_move else -score)
+                positions[key] = (transform_move(move_bit, symmetry).bit_length() - 1, mover_score)
+            flips = get_flips_bitboard(own, opp, move_bit)
+            own, opp, black_to_move = opp ^ flips, own | move_bit | flips, not black_to_move
+    return positions
+
+def compile_book(positions):
+    """
+    Encodes collected positions in the compiled book format.
+
+    Args:
+        positions (dict): The positions, as returned by collect_positions.
+
+    Returns:
+        bytearray: The compiled book.
+    """
+    data = bytearray(HEADER.size + len(positions) * RECORD.size)
+    HEADER.pack_into(data, 0, BOOK_MAGIC, len(positions))
+    offset = HEADER.size
+    for key in sorted(positions):
+        move, score = positions[key]
+        RECORD.pack_into(data, offset, key >> 64, key & 0xFFFFFFFFFFFFFFFF, move, max(-64, min(64, score)))
+        offset += RECORD.size
+    return data
+
+def build_book(sources, output=DEFAULT_BOOK_PATH, builtin=True):
+    """
+    Compiles text books into a book file.
+
+    Args:
+        sources (list): Paths of text books, one line per parse_line; blank lines
+            and lines starting with "#" are skipped.
+        output (str): The compiled book file to write.
+        builtin (bool): Whether to include the built-in lines (first, so they take precedence).
+
+    Returns:
+        int: The number of positions written.
+
+    Raises:
+        ValueError: If a line is malformed or plays an illegal move.
+    """
+    positions = collect_positions(BOOK_LINES) if builtin else {}
+    for source in sources:
+        with open(source) as text:
+            for number, line in enumerate(text, 1):
+                if not line.strip() or line.startswith("#"):
+                    continue
+                try:
+                    collect_positions([parse_line(line)], positions)
+                except ValueError as error:
+                    raise ValueError(f"{source}:{number}: {error}") from None
+    # Written next to the target and renamed, so running engines keep a complete file.
+    temporary = output + ".tmp"
+    with open(temporary, "wb") as book:
+        book.write(compile_book(positions))
+    os.replace(temporary, output)
+    return len(positions)
 
 _book_instance = OpeningBook()
 
@@ -94,3 +302,21 @@ def get_opening_move(board, player):
         tuple or None: The (row, col) of the move, or None if not found.
     """
     return _book_instance.get_move(board, player)
+
+def main():
+    """Parses the command line and compiles the book."""
+    # Imported here to keep importing the book module cheap.
+    import argparse
+    parser = argparse.ArgumentParser(description="Compiles text opening books into the binary book the AI memory-maps.")
+    parser.add_argument("sources", nargs="*", help="Text books: one line of moves per line (e.g. f5d6c3 -2).")
+    parser.add_argument("--output", default=DEFAULT_BOOK_PATH, help="The compiled book file.")
+    parser.add_argument("--no-builtin", action="store_true", help="Leave out the built-in lines.")
+    args = parser.parse_args()
+    try:
+        count = build_book(args.sources, args.output, not args.no_builtin)
+    except (OSError, ValueError) as error:
+        parser.exit(1, f"error: {error}\n")
+    print(f"{count} positions written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import atexit
+import multiprocessing
+import queue
+from search_control import SearchControl
+
+# How long stop() waits for a report before checking that the helpers are
+# still alive, and how long close() waits for each helper to exit.
+STOP_TIMEOUT = 1.0
+
+# The running pools, shut down at exit.
+_pools = set()
+
+class HelperPool:
+    """
+    Helper processes for a Lazy SMP search.
+
+    While the main process runs its iterative deepening, every helper runs
+    its own on the same position, half of them starting one ply deeper so
+    that they get ahead of the main search. All of them share the main
+    process's transposition table through shared memory: the helpers do not
+    return moves, they fill the table with results the main search then
+    finds instead of searching.
+
+    Helpers are started once and then wait for positions between moves.
+    Every pool serves one table: each engine that searches with helpers
+    has its own pool (see get_helpers).
+    """
+    def __init__(self, count, table, settings):
+        """
+        Start the helper processes.
+
+        Args:
+            count (int): The number of helper processes.
+            table (TranspositionTable): The main process's table, which is moved
+                into shared memory (discarding its entries) if it is not there yet.
+            settings (dict): The keyword arguments of the helpers' engines, so they
+                store positions in the table as the main engine does.
+        """
+        self.count = count
+        self.table = table
+        self.table_name = table.share()
+        self.settings = settings
+        self._search_id = 0
+        self._stop_event = multiprocessing.Event()
+        self._tasks = multiprocessing.Queue()
+        self._results = multiprocessing.Queue()
+        self._processes = []
+        for _ in range(count):
+            process = multiprocessing.Process(
+                target=_helper_main,
+                args=(self.table_name, table.size_mb, settings, self._tasks, self._results, self._stop_event),
+                daemon=True)
+            process.start()
+            self._processes.append(process)
+        _pools.add(self)
+
+    @property
+    def alive(self):
+        """bool: True while every helper process is running."""
+        return bool(self._processes) and all(process.is_alive() for process in self._processes)
+
+    def start(self, own, opp, player, moves_mask, generation):
+        """
+        Sets every helper searching a position.
+
+        Args:
+            own (int): Bitboard for the current player.
+            opp (int): Bitboard for the opponent.
+            player (str): The player color.
+            moves_mask (int): The legal move bitboard at the root.
+            generation (int): The main table's current generation, so helpers age entries alike.
+        """
+        # stop() waited for every helper, so none is still searching when the event is cleared.
+        self._stop_event.clear()
+        self._search_id += 1
+        for i in range(self.count):
+            start_depth = 2 - i % 2
+            self._tasks.put((self._search_id, own, opp, player, moves_mask, generation, start_depth))
+
+    def stop(self):
+        """
+        Stops every helper and waits until all of them have reported.
+
+        Reports of earlier searches are discarded. If a helper has died, its
+        report never comes, so the pool is closed instead (and get_helpers
+        starts a new one for the next search).
+
+        Returns:
+            int: The number of nodes the helpers searched.
+        """
+        self._stop_event.set()
+        nodes = 0
+        pending = self.count
+        while pending:
+            try:
+                search_id, helper_nodes = self._results.get(timeout=STOP_TIMEOUT)
+            except queue.Empty:
+                if self.alive:
+                    continue
+                self.close()
+                break
+            if search_id == self._search_id:
+                nodes += helper_nodes
+                pending -= 1
+        return nodes
+
+    def close(self):
+        """Shuts the helper processes down and frees the shared table."""
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(STOP_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        # Reallocating moves the table back out of shared memory, unless it
+        # has already left it (e.g. resized).
+        if self.table.shared_name == self.table_name:
+            self.table.resize(self.table.size_mb)
+        _pools.discard(self)
+
+def _helper_main(table_name, size_mb, settings, tasks, results, stop_event):
+    """
+    The loop run by a helper process: search each position received until told to stop.
+
+    Args:
+        table_name (str): The name of the shared transposition table.
+        size_mb (float): The memory budget the shared table was created with.
+        settings (dict): The keyword arguments of the helper's engine.
+        tasks (Queue): Positions to search, tagged with a search id, or None to exit.
+        results (Queue): Receives the search id and node count of every search.
+        stop_event (Event): Set by the main process to stop the current search.
+    """
+    # Imported here because ai imports this module.
+    import ai
+    # The engine's own table is replaced by the shared one, so it starts at the smallest size.
+    engine = ai.Engine(0, **settings)
+    engine.table.attach(table_name, size_mb)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        search_id, own, opp, player, moves_mask, generation, start_depth = task
+        engine.table.generation = generation
+        engine.ordering.new_search()
+        control = SearchControl(stop_event=stop_event)
+        nodes = engine.search_iterative(own, opp, player, moves_mask, control, start_depth=start_depth)[3]
+        results.put((search_id, nodes))
+    # Let go of the shared table before exiting (the main process unlinks it).
+    engine.table.resize(0)
+
+def get_helpers(pool, count, table, settings):
+    """
+    Returns a helper pool for a table, starting or restarting it when needed.
+
+    The caller keeps the pool between moves (e.g. an engine keeps its own).
+    It is replaced when it has been closed or lost a helper, when the number of helpers or
+    the settings change, or when the table has been reallocated (e.g.
+    resized) since the pool was started. The replaced pool is closed, which
+    frees its shared table.
+
+    Args:
+        pool (HelperPool or None): The caller's current pool.
+        count (int): The number of helper processes.
+        table (TranspositionTable): The main process's table.
+        settings (dict): The keyword arguments of the helpers' engines.
+
+    Returns:
+        HelperPool: The running pool.
+    """
+    if pool is not None and (not pool.alive or pool.count != count or pool.table is not table
+                             or pool.table_name != table.shared_name or pool.settings != settings):
+        pool.close()
+        pool = None
+    if pool is None:
+        pool = HelperPool(count, table, settings)
+    return pool
+
+def shutdown():
+    """Shuts down every helper pool and frees the shared tables."""
+    for pool in list(_pools):
+        pool.close()
+
+atexit.register(shutdown)
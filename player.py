@@ -1,17 +1,22 @@
 from constants import BOARD_SIZE
-from game_logic import is_valid_move
+from game_logic import TurnState
 
-def get_human_move(board, player):
+def get_human_move(board, player, turn=None):
     """
     Prompts the human player for a move and validates it.
 
     Args:
-        board (list): The current game board.
+        board (Board or list): The current game board.
         player (str): The color of the current player.
+        turn (TurnState, optional): The precomputed state of this turn. Computed
+            from the board if not given.
 
     Returns:
         tuple: The coordinates (row, col) of the valid move entered by the user.
     """
+    if turn is None:
+        turn = TurnState(board, player)
+
     while True:
         try:
             move_str = input(f"Enter move (e.g. C4): ").strip().upper()
@@ -30,7 +35,7 @@ def get_human_move(board, player):
             row = int(row_str) - 1
             
             if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
-                if is_valid_move(board, row, col, player):
+                if turn.is_valid_move(row, col):
                     return (row, col)
                 else:
                     print("Invalid move. Try again.")
@@ -0,0 +1,90 @@
+import threading
+import ai
+from endgame import solve_endgame, solve_wld
+from search_control import SearchControl
+
+class Ponderer:
+    """
+    Searches the opponent's position on a background thread while they think.
+
+    The search runs with no deadline and fills the engine's tables: the
+    transposition table for the replies to every move the opponent may
+    play, or, close to the end, the endgame solvers' table, solving for
+    win/loss/draw or exactly as the engine's own move will be. When the
+    opponent's move arrives, stop() ends the search and the engine's own
+    search starts from the warm tables.
+
+    The engine's tables are not locked, so the engine must not search
+    while pondering; stop() returns once the background search has ended.
+    """
+    def __init__(self, engine=None):
+        """
+        Initialize an idle ponderer.
+
+        Args:
+            engine (Engine, optional): The engine whose tables the background search fills;
+                the default engine (see ai.default_engine) if not given.
+        """
+        self.engine = engine if engine is not None else ai.default_engine()
+        self._thread = None
+        self._control = None
+        self._result = None
+
+    @property
+    def active(self):
+        """bool: True while a background search is running."""
+        return self._thread is not None
+
+    def start(self, turn):
+        """
+        Starts searching the opponent's position.
+
+        Args:
+            turn (TurnState): The state of the opponent's turn. Nothing is searched
+                if they have no legal move.
+        """
+        self.stop()
+        if not turn.has_valid_move:
+            return
+        self._control = SearchControl()
+        self._result = None
+        self._thread = threading.Thread(target=self._run, args=(turn, self._control), daemon=True)
+        self._thread.start()
+
+    def _run(self, turn, control):
+        """
+        The background search.
+
+        Args:
+            turn (TurnState): The state of the opponent's turn.
+            control (SearchControl): Stops the search when the opponent has moved.
+        """
+        engine = self.engine
+        engine.ordering.new_search()
+        # The same phases as the engine's own move (see Engine.search_move),
+        # so the tables its move will use are the ones that get warm.
+        empty_count = turn.board.empty_count()
+        if empty_count <= engine.endgame_empties:
+            result = solve_endgame(turn.own, turn.opp, control, engine.endgame_table, turn.moves_mask)
+            self._result = result[1] if result is not None else None
+        elif empty_count <= engine.wld_empties:
+            result = solve_wld(turn.own, turn.opp, control, engine.endgame_table, turn.moves_mask)
+            self._result = result[1] if result is not None else None
+        else:
+            self._result = engine.search_iterative(turn.own, turn.opp, turn.player, turn.moves_mask, control)[0]
+
+    def stop(self):
+        """
+        Stops the background search and waits for it to end.
+
+        Returns:
+            int or None: The opponent's move the search expected, as a single-bit mask,
+            or None if no search was running or none completed.
+        """
+        if self._thread is None:
+            return None
+        self._control.stop()
+        self._thread.join()
+        self._thread = None
+        self._control = None
+        return self._result
@@ -0,0 +1,103 @@
+import threading
+import time
+
+# Searches count nodes and only look at the clock and the stop flag every
+# POLL_INTERVAL nodes, which is a few milliseconds of search.
+POLL_INTERVAL = 1024
+
+class SearchControl:
+    """
+    Decides when a search has to stop: at its deadline, at its node limit, or when stop() is called.
+
+    A search increments ``nodes`` at every node and calls poll() whenever
+    ``nodes`` reaches ``next_poll``. Once poll() has returned True,
+    ``stopped`` stays set, and every node returns straight away without
+    storing anything, so the search unwinds without an exception and the
+    caller keeps the result of the last completed iteration.
+
+    stop() may be called from any thread, e.g. a UI thread asking the engine
+    to move now. The request persists across phases (see start) until the
+    control is discarded.
+
+    After every completed pass the search reports its result, which another
+    thread can read from ``progress`` to show how the search is going.
+    With ``stats`` set to a SearchStats, the search also fills in its counters.
+    """
+    def __init__(self, time_limit=None, poll_interval=POLL_INTERVAL, stop_event=None, stats=None, node_limit=None):
+        """
+        Initialize the control and start timing.
+
+        Args:
+            time_limit (float, optional): Seconds allowed for the search, or None for no deadline.
+            poll_interval (int): The number of nodes between two polls.
+            stop_event (Event, optional): The event that stop() sets and poll() checks,
+                e.g. a ``multiprocessing.Event`` shared with other processes. A new
+                ``threading.Event`` by default.
+            stats (SearchStats, optional): Collects statistics about the search.
+            node_limit (int, optional): The number of nodes after which the search stops,
+                over all phases. It is only checked when polling.
+        """
+        self.poll_interval = poll_interval
+        self.nodes = 0
+        self.progress = None
+        self.stats = stats
+        self.node_limit = node_limit
+        self._stop_requested = threading.Event() if stop_event is None else stop_event
+        self.start(time_limit)
+
+    def start(self, time_limit=None, start_time=None):
+        """
+        Starts a new phase of the search with its own deadline.
+
+        Args:
+            time_limit (float, optional): Seconds allowed for this phase, or None for no deadline.
+            start_time (float, optional): The time the phase started, if not now.
+        """
+        self.start_time = time.time() if start_time is None else start_time
+        self.deadline = None if time_limit is None else self.start_time + time_limit
+        self.next_poll = self.nodes + self.poll_interval
+        self.stopped = self._stop_requested.is_set()
+
+    def stop(self):
+        """Asks the search to stop as soon as possible. Safe to call from any thread."""
+        self._stop_requested.set()
+
+    @property
+    def stop_requested(self):
+        """bool: True if stop() has been called."""
+        return self._stop_requested.is_set()
+
+    def report(self, depth, score, move_bit):
+        """
+        Records the result of a completed pass.
+
+        Args:
+            depth (int): The depth of the pass.
+            score (float): The score of the best move.
+            move_bit (int): The best move as a single-bit mask.
+        """
+        self.progress = (depth, score, move_bit)
+        if self.stats is not None:
+            self.stats.add_iteration(depth, score, move_bit.bit_length() - 1, self.nodes, self.elapsed())
+
+    def poll(self):
+        """
+        Checks the stop flag, the deadline and the node limit, and schedules the next poll.
+
+        Returns:
+            bool: True if the search has to stop.
+        """
+        self.next_poll = self.nodes + self.poll_interval
+        if (self._stop_requested.is_set() or (self.deadline is not None and time.time() > self.deadline)
+                or (self.node_limit is not None and self.nodes >= self.node_limit)):
+            self.stopped = True
+        return self.stopped
+
+    def elapsed(self):
+        """
+        Measures the time spent in the current phase.
+
+        Returns:
+            float: Seconds since the current phase started.
+        """
+        return time.time() - self.start_time
@@ -0,0 +1,108 @@
+import json
+
+class SearchStats:
+    """
+    Counters describing one search, for tuning the engine.
+
+    Statistics are opt-in: pass a SearchStats to get_best_move (or set it as
+    a SearchControl's ``stats``) and the search fills it in, or call
+    get_best_move with ``return_stats=True`` to get a new one back with the
+    move. Without one, each node of the search only pays for a few ``is None``
+    checks.
+
+    ``nodes`` counts every node of the move, including the endgame solvers
+    and the helper processes of a parallel search; the other counters cover
+    this process's midgame search. ``phase`` names what
+    decided the move: "book", "single" (the only legal move), "exact" or
+    "wld" (the endgame solvers) or "search".
+
+    Attributes:
+        phase (str): What decided the move.
+        nodes (int): The number of nodes searched.
+        time (float): Seconds spent on the move.
+        leaf_evals (int): Positions scored by the evaluation function.
+        tt_probes (int): Transposition table lookups.
+        tt_hits (int): Lookups that found the position.
+        tt_cutoffs (int): Nodes answered from the table without searching.
+        beta_cutoffs (int): Nodes whose search was cut off by a move.
+        first_move_cutoffs (int): Cutoffs caused by the first move searched.
+        iterations (list): One dict per completed iterative-deepening pass, with
+            its depth, score, move and the nodes and time used up to its end.
+    """
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self.phase = None
+        self.nodes = 0
+        self.time = 0.0
+        self.leaf_evals = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.iterations = []
+
+    def add_iteration(self, depth, score, move, nodes, elapsed):
+        """
+        Records a completed iterative-deepening pass.
+
+        Args:
+            depth (int): The depth of the pass.
+            score (float): The score of the best move.
+            move (int): The best move as a square index (row * 8 + col).
+            nodes (int): The nodes searched so far.
+            elapsed (float): Seconds spent so far.
+        """
+        self.iterations.append({"depth": depth, "score": round(score, 4), "move": move,
+                                "nodes": nodes, "time": round(elapsed, 4)})
+
+    @property
+    def depth(self):
+        """int: The depth of the last completed pass, 0 if none completed."""
+        return self.iterations[-1]["depth"] if self.iterations else 0
+
+    @property
+    def tt_hit_rate(self):
+        """float: The share of table lookups that found the position."""
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self):
+        """float: The share of cutoffs caused by the first move, a measure of move ordering."""
+        return self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    def as_dict(self):
+        """
+        Collects the statistics in a dictionary.
+
+        Returns:
+            dict: The counters, the derived rates and the iterations.
+        """
+        return {
+            "phase": self.phase,
+            "nodes": self.nodes,
+            "time": round(self.time, 4),
+            "nps": round(self.nodes / self.time) if self.time > 0 else 0,
+            "depth": self.depth,
+            "leaf_evals": self.leaf_evals,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_hit_rate": round(self.tt_hit_rate, 4),
+            "tt_cutoffs": self.tt_cutoffs,
+            "beta_cutoffs": self.beta_cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": round(self.first_move_cutoff_rate, 4),
+            "iterations": self.iterations,
+        }
+
+    def to_json(self, **extra):
+        """
+        Formats the statistics as one JSON line.
+
+        Args:
+            **extra: Further fields to include, e.g. an identifier for the position.
+
+        Returns:
+            str: The statistics as a single-line JSON object, without a newline.
+        """
+        return json.dumps({**extra, **self.as_dict()})
@@ -0,0 +1,197 @@
+from bitboard import FULL_MASK
+
+# Board Symmetries
+# An Othello position looks the same in all eight orientations of the
+# square (four rotations, each optionally mirrored), and so does its
+# evaluation. Each transform below rearranges a bitboard with a few delta
+# swaps: masked XORs that exchange groups of bits a fixed distance apart.
+
+def flip_vertical(x):
+    """
+    Mirrors a bitboard top to bottom: row r becomes row 7 - r.
+
+    Args:
+        x (int): The bitboard.
+
+    Returns:
+        int: The transformed bitboard.
+    """
+    x = ((x >> 8) & 0x00FF00FF00FF00FF) | ((x & 0x00FF00FF00FF00FF) << 8)
+    x = ((x >> 16) & 0x0000FFFF0000FFFF) | ((x & 0x0000FFFF0000FFFF) << 16)
+    return (x >> 32) | ((x << 32) & FULL_MASK)
+
+def mirror_horizontal(x):
+    """
+    Mirrors a bitboard left to right: column c becomes column 7 - c.
+
+    Args:
+        x (int): The bitboard.
+
+    Returns:
+        int: The transformed bitboard.
+    """
+    x = ((x >> 1) & 0x5555555555555555) | ((x & 0x5555555555555555) << 1)
+    x = ((x >> 2) & 0x3333333333333333) | ((x & 0x3333333333333333) << 2)
+    return ((x >> 4) & 0x0F0F0F0F0F0F0F0F) | ((x & 0x0F0F0F0F0F0F0F0F) << 4)
+
+def flip_diagonal(x):
+    """
+    Mirrors a bitboard about the A1-H8 diagonal: square (r, c) becomes (c, r).
+
+    Args:
+        x (int): The bitboard.
+
+    Returns:
+        int: The transformed bitboard.
+    """
+    t = 0x0F0F0F0F00000000 & (x ^ (x << 28))
+    x ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (x ^ (x << 14))
+    x ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (x ^ (x << 7))
+    return x ^ t ^ (t >> 7)
+
+def flip_anti_diagonal(x):
+    """
+    Mirrors a bitboard about the A8-H1 diagonal: square (r, c) becomes (7 - c, 7 - r).
+
+    Args:
+        x (int): The bitboard.
+
+    Returns:
+        int: The transformed bitboard.
+    """
+    t = x ^ (x << 36)
+    x ^= 0xF0F0F0F00F0F0F0F & (t ^ (x >> 36))
+    t = 0xCCCC0000CCCC0000 & (x ^ (x << 18))
+    x ^= t ^ (t >> 18)
+    t = 0xAA00AA00AA00AA00 & (x ^ (x << 9))
+    return x ^ t ^ (t >> 9)
+
+def rotate_180(x):
+    """
+    Rotates a bitboard by 180 degrees: square (r, c) becomes (7 - r, 7 - c).
+
+    Args:
+        x (int): The bitboard.
+
+    Returns:
+        int: The transformed bitboard.
+    """
+    return mirror_horizontal(flip_vertical(x))
+
+def rotate_90(x):
+    """
+    Rotates a bitboard a quarter turn: square (r, c) becomes (c, 7 - r).
+
+    Args:
+        x (int): The bitboard.
+
+    Returns:
+        int: The transformed bitboard.
+    """
+    return flip_diagonal(flip_vertical(x))
+
+def rotate_270(x):
+    """
+    Rotates a bitboard three quarter turns: square (r, c) becomes (7 - c, r).
+
+    Args:
+        x (int): The bitboard.
+
+    Returns:
+        int: The transformed bitboard.
+    """
+    return flip_vertical(flip_diagonal(x))
+
+def identity(x):
+    """
+    Leaves a bitboard as it is.
+
+    Args:
+        x (int): The bitboard.
+
+    Returns:
+        int: The same bitboard.
+    """
+    return x
+
+# SYMMETRIES[s] is the s-th transform. INVERSES[s] is the index of the
+# transform that undoes it: every symmetry but the quarter turns is its own inverse.
+SYMMETRIES = [identity, flip_vertical, mirror_horizontal, rotate_180,
+              flip_diagonal, flip_anti_diagonal, rotate_90, rotate_270]
+INVERSES = [0, 1, 2, 3, 4, 5, 7, 6]
+
+# The index into SYMMETRIES of each image built by canonical, in build order.
+IMAGE_SYMMETRIES = [0, 1, 2, 3, 4, 6, 7, 5]
+
+# Lane masks for transforming two bitboards packed into one 128-bit integer
+# (own << 64 | opp): every delta swap stays within its 64-bit lane, so one
+# pass transforms both bitboards.
+_LANES = 1 | 1 << 64
+_V8, _V16, _V32 = 0x00FF00FF00FF00FF * _LANES, 0x0000FFFF0000FFFF * _LANES, 0x00000000FFFFFFFF * _LANES
+_H1, _H2, _H4 = 0x5555555555555555 * _LANES, 0x3333333333333333 * _LANES, 0x0F0F0F0F0F0F0F0F * _LANES
+_D28, _D14, _D7 = 0x0F0F0F0F00000000 * _LANES, 0x3333000033330000 * _LANES, 0x5500550055005500 * _LANES
+
+def canonical(own, opp):
+    """
+    Finds the canonical orientation of a position: the smallest of its eight images.
+
+    Positions that are symmetric to each other have the same canonical
+    form, so a table keyed by it stores them once.
+
+    Args:
+        own (int): Bitboard for the side to move.
+        opp (int): Bitboard for the other side.
+
+    Returns:
+        tuple: A tuple (own, opp, symmetry) with the canonical bitboards and the index
+        into SYMMETRIES of the transform that produced them.
+    """
+    # The images are built from the packed position by three base
+    # transforms, inlined: flip_vertical, then mirror_horizontal of both
+    # images so far, then flip_diagonal of all four.
+    x = own << 64 | opp
+    v = ((x >> 8) & _V8) | ((x & _V8) << 8)
+    v = ((v >> 16) & _V16) | ((v & _V16) << 16)
+    v = ((v >> 32) & _V32) | ((v & _V32) << 32)
+    images = [x, v]
+    for x in (x, v):
+        x = ((x >> 1) & _H1) | ((x & _H1) << 1)
+        x = ((x >> 2) & _H2) | ((x & _H2) << 2)
+        images.append(((x >> 4) & _H4) | ((x & _H4) << 4))
+    for x in images[:4]:
+        t = _D28 & (x ^ (x << 28))
+        x ^= t ^ (t >> 28)
+        t = _D14 & (x ^ (x << 14))
+        x ^= t ^ (t >> 14)
+        t = _D7 & (x ^ (x << 7))
+        images.append(x ^ t ^ (t >> 7))
+    best = min(images)
+    return best >> 64, best & FULL_MASK, IMAGE_SYMMETRIES[images.index(best)]
+
+def transform_move(move_bit, symmetry):
+    """
+    Maps a move into another orientation.
+
+    Args:
+        move_bit (int): The move as a single-bit mask.
+        symmetry (int): The index into SYMMETRIES of the transform to apply.
+
+    Returns:
+        int: The transformed move as a single-bit mask.
+    """
+    return SYMMETRIES[symmetry](move_bit)
+
+def restore_move(move_bit, symmetry):
+    """
+    Maps a move found in a canonical orientation back to the real one.
+
+    Args:
+        move_bit (int): The move in the canonical orientation, as a single-bit mask.
+        symmetry (int): The symmetry canonical returned for the real position.
+
+    Returns:
+        int: The move in the real orientation, as a single-bit mask.
+    """
+    return SYMMETRIES[INVERSES[symmetry]](move_bit)
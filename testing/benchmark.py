@@ -9,7 +9,7 @@ from tqdm import tqdm
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from constants import BLACK, WHITE, EMPTY, BOARD_SIZE
-from game_logic import create_board, is_game_over, get_winner, get_score, has_valid_move, apply_move
+from game_logic import create_board, get_winner, get_score, apply_move, TurnState
 
 # Import AIs
 # We need to make sure they can import game_logic/constants from parent too
@@ -35,11 +35,12 @@ def play_game(game_id, phase):
     start_time = time.time()
     move_count = 0
     
-    while not is_game_over(board):
-        if not has_valid_move(board, current_player):
-            current_player = WHITE if current_player == BLACK else BLACK
-            if not has_valid_move(board, current_player):
-                break
+    turn = TurnState(board, current_player)
+    
+    while not turn.is_game_over:
+        if turn.must_pass:
+            turn = turn.after_pass()
+            current_player = turn.player
             continue
             
         move_start = time.time()
@@ -77,6 +78,7 @@ def play_game(game_id, phase):
             pass
             
         current_player = WHITE if current_player == BLACK else BLACK
+        turn = TurnState(board, current_player)
         
     end_time = time.time()
     total_time = end_time - start_time
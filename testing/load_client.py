@@ -0,0 +1,100 @@
+import sys
+import os
+import time
+import random
+import asyncio
+import argparse
+
+# Add parent directory to path so we can import the server's defaults
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_server import DEFAULT_PORT
+
+async def play_game(args, rng, latencies):
+    """
+    Plays one game against the server with random legal moves.
+
+    Args:
+        args (Namespace): The command line arguments.
+        rng (Random): Picks the client's moves and color.
+        latencies (list): Receives the seconds from each client move (or the
+            new command) to the server's next turn or gameover line.
+
+    Returns:
+        int: The number of computer moves in the game.
+    """
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    computer_moves = 0
+    try:
+        color = rng.choice("bw")
+        writer.write(f"new {color} time {args.time} increment {args.increment}\n".encode())
+        sent = time.perf_counter()
+        while True:
+            words = (await reader.readline()).decode().split()
+            if not words:
+                raise ConnectionError("server closed the connection")
+            if words[0] == "move":
+                computer_moves += words[1] != "pass"
+            elif words[0] == "error":
+                raise RuntimeError(" ".join(words))
+            elif words[0] in ("turn", "gameover"):
+                latencies.append(time.perf_counter() - sent)
+                if words[0] == "gameover":
+                    break
+                writer.write(f"move {rng.choice(words[1:])}\n".encode())
+                sent = time.perf_counter()
+        writer.write(b"quit\n")
+        await writer.drain()
+    finally:
+        writer.close()
+    return computer_moves
+
+async def run(args):
+    """
+    Plays --games games, at most --concurrency at once, and reports throughput and latency.
+
+    Args:
+        args (Namespace): The command line arguments.
+    """
+    rng = random.Random(args.seed)
+    latencies = []
+    computer_moves = 0
+    pending = args.games
+
+    async def client():
+        nonlocal pending, computer_moves
+        while pending > 0:
+            pending -= 1
+            moves = await play_game(args, random.Random(rng.random()), latencies)
+            computer_moves += moves
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+    print(f"{args.games} games, {args.concurrency} at once, in {elapsed:.1f} s")
+    print(f"throughput: {args.games / elapsed:.2f} games/s, {computer_moves / elapsed:.1f} computer moves/s")
+    print(f"move latency: p50 {percentile(50) * 1000:.0f} ms, p90 {percentile(90) * 1000:.0f} ms, "
+          f"p99 {percentile(99) * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for game_server.py.")
+    parser.add_argument("--host", default="127.0.0.1", help="The server's address.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="The server's TCP port.")
+    parser.add_argument("--unix", help="The server's Unix socket path, instead of TCP.")
+    parser.add_argument("--games", type=int, default=20, help="The number of games to play.")
+    parser.add_argument("--concurrency", type=int, default=10, help="The number of games played at once.")
+    parser.add_argument("--time", type=float, default=5.0, help="Seconds on the computer's clock per game.")
+    parser.add_argument("--increment", type=float, default=0.0, help="Seconds added to the computer's clock per move.")
+    parser.add_argument("--seed", type=int, default=2025, help="Random seed for the client's moves.")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,565 @@
+import sys
+import os
+import time
+import random
+import argparse
+from contextlib import contextmanager
+
+# Add parent directory to path so we can import the engine modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import BLACK, WHITE
+from game_logic import Board, TurnState, create_board
+import bitboard
+import endgame
+import ai
+from search_control import SearchControl
+from ponder import Ponderer
+from search_stats import SearchStats
+import analysis
+import symmetry
+import opening_book
+
+# The frozen copy of the engine keeps the original loop-based primitives,
+# which serve as the baseline for the micro-benchmarks below.
+import testing.new_ai as new_ai
+
+def ray_walk_flips(own, opp, move_mask):
+    """
+    Returns the flip mask computed by the original ray-walking apply_move_bitboard.
+    """
+    return opp & ~new_ai.apply_move_bitboard(own, opp, move_mask)[1]
+
+def scratch_evaluate(own, opp, positional, disc_diff):
+    """
+    Stands in for ai.evaluate_incremental but ignores the carried accumulators
+    and evaluates from scratch with the original function.
+    """
+    return new_ai.evaluate_bitboard(own, opp, True)
+
+def build_positions(count, min_empties, max_empties, seed):
+    """
+    Builds a reproducible suite of positions from random playouts.
+
+    Args:
+        count (int): The number of positions to collect.
+        min_empties (int): The minimum number of empty squares in a position.
+        max_empties (int): The maximum number of empty squares in a position.
+        seed (int): The random seed.
+
+    Returns:
+        list: A list of (own, opp) bitboard pairs where the side to move has a legal move.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        own, opp = 0x0000000810000000, 0x0000001008000000
+        target = rng.randint(min_empties, max_empties)
+        while True:
+            moves = bitboard.get_valid_moves_bitboard(own, opp)
+            if not moves:
+                own, opp = opp, own
+                if not bitboard.get_valid_moves_bitboard(own, opp):
+                    break
+                continue
+            if 64 - (own | opp).bit_count() == target:
+                positions.append((own, opp))
+                break
+            bits = [1 << i for i in range(64) if moves >> i & 1]
+            own, opp = bitboard.apply_move_bitboard(own, opp, rng.choice(bits))
+            own, opp = opp, own
+    return positions
+
+class NodeCounter:
+    """
+    Counts search nodes by wrapping a module's or class's recursive search function for the duration of a with-block.
+    """
+    def __init__(self, module=ai.Engine, name="negamax"):
+        self.module = module
+        self.name = name
+
+    def __enter__(self):
+        self.nodes = 0
+        self._original = getattr(self.module, self.name)
+
+        def counted(*args):
+            self.nodes += 1
+            return self._original(*args)
+
+        setattr(self.module, self.name, counted)
+        return self
+
+    def __exit__(self, *exc):
+        setattr(self.module, self.name, self._original)
+
+@contextmanager
+def swapped(module, name, replacement):
+    """
+    Temporarily replaces a module attribute, e.g. to run the search with a baseline primitive.
+    """
+    original = getattr(module, name)
+    setattr(module, name, replacement)
+    try:
+        yield
+    finally:
+        setattr(module, name, original)
+
+def legal_moves(positions):
+    """
+    Expands positions into every legal (own, opp, move_mask) triple.
+    """
+    cases = []
+    for own, opp in positions:
+        moves = bitboard.get_valid_moves_bitboard(own, opp)
+        while moves:
+            move = moves & -moves
+            cases.append((own, opp, move))
+            moves ^= move
+    return cases
+
+def run_search(positions, depth, rounds):
+    """
+    Searches every position to a fixed depth with a cold transposition table.
+
+    Args:
+        positions (list): The (own, opp) positions to search.
+        depth (int): The search depth.
+        rounds (int): How many times to repeat the run; the fastest is kept.
+
+    Returns:
+        tuple: A tuple (nodes, seconds).
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        with NodeCounter() as counter:
+            start = time.perf_counter()
+            for own, opp in positions:
+                ai.default_engine().new_game()
+                ai.get_best_move_fixed_depth_bitboard(own, opp, depth, float('inf'), BLACK)
+            best = min(best, time.perf_counter() - start)
+    return counter.nodes, best
+
+def run_deepening(positions, depth):
+    """
+    Runs iterative deepening up to a fixed depth on every position with the current search.
+
+    Each pass after the first uses an aspiration window around the previous score.
+
+    Returns:
+        tuple: A tuple (nodes, moves) with the node count and the best move found for each position.
+    """
+    moves = []
+    with NodeCounter() as counter:
+        for own, opp in positions:
+            ai.default_engine().new_game()
+            score = None
+            control = SearchControl()
+            for d in range(1, depth + 1):
+                score, move = ai.default_engine().search_aspiration(own, opp, d, score, control, BLACK)
+            moves.append(move)
+    return counter.nodes, moves
+
+def run_original_deepening(positions, depth):
+    """
+    Runs iterative deepening up to a fixed depth on every position with the original
+    full-window alpha-beta search.
+
+    Returns:
+        tuple: A tuple (nodes, moves) with the node count and the best move found for each position.
+    """
+    moves = []
+    with NodeCounter(new_ai, "minmax_bitboard") as counter:
+        for own, opp in positions:
+            new_ai.TRANSPOSITION_TABLE.clear()
+            for d in range(1, depth + 1):
+                row, col = new_ai.get_best_move_fixed_depth_bitboard(own, opp, d, float('inf'), BLACK)
+            moves.append(1 << (row * 8 + col))
+    return counter.nodes, moves
+
+def time_calls(func, positions, repeat, rounds):
+    """
+    Times a bitboard primitive over every position.
+
+    Args:
+        func (callable): A function taking (own, opp).
+        positions (list): The (own, opp) positions.
+        repeat (int): How many passes over the positions to time.
+        rounds (int): How many times to repeat the timing; the fastest is kept.
+
+    Returns:
+        float: Calls per second.
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for own, opp in positions:
+                func(own, opp)
+                func(opp, own)
+        best = min(best, time.perf_counter() - start)
+    return 2 * repeat * len(positions) / best
+
+def time_moves(func, cases, repeat, rounds):
+    """
+    Times a make-move primitive over every legal move of the suite.
+
+    Args:
+        func (callable): A function taking (own, opp, move_mask).
+        cases (list): The (own, opp, move_mask) triples.
+        repeat (int): How many passes over the moves to time.
+        rounds (int): How many times to repeat the timing; the fastest is kept.
+
+    Returns:
+        float: Calls per second.
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for own, opp, move in cases:
+                func(own, opp, move)
+        best = min(best, time.perf_counter() - start)
+    return repeat * len(cases) / best
+
+def report(label, baseline, candidate, unit):
+    print(f"{label:<28}{baseline:>14,.0f}{candidate:>14,.0f}  {unit}  x{candidate / baseline:.2f}")
+
+def bench_movegen(args):
+    """
+    Compares the Kogge-Stone move generator with the original loop version.
+    """
+    positions = build_positions(args.positions, args.min_empties, args.max_empties, args.seed)
+    for own, opp in positions:
+        assert bitboard.get_valid_moves_bitboard(own, opp) == new_ai.get_valid_moves_bitboard(own, opp)
+
+    print(f"{'':<28}{'loop':>14}{'kogge-stone':>14}")
+    report("move generation", time_calls(new_ai.get_valid_moves_bitboard, positions, args.repeat, args.rounds),
+           time_calls(bitboard.get_valid_moves_bitboard, positions, args.repeat, args.rounds), "calls/s")
+
+    with swapped(ai, "get_valid_moves_bitboard", new_ai.get_valid_moves_bitboard):
+        loop_nodes, loop_time = run_search(positions, args.depth, args.rounds)
+    nodes, elapsed = run_search(positions, args.depth, args.rounds)
+    assert nodes == loop_nodes
+    report(f"search depth {args.depth} ({nodes} nodes)", loop_nodes / loop_time, nodes / elapsed, "nodes/s")
+
+def time_evals(func, positions, repeat, rounds):
+    """
+    Times an evaluation function over every position.
+
+    Args:
+        func (callable): A function taking (own, opp, current_player_is_black).
+        positions (list): The (own, opp) positions.
+        repeat (int): How many passes over the positions to time.
+        rounds (int): How many times to repeat the timing; the fastest is kept.
+
+    Returns:
+        float: Calls per second.
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for own, opp in positions:
+                func(own, opp, True)
+        best = min(best, time.perf_counter() - start)
+    return repeat * len(positions) / best
+
+def bench_eval(args):
+    """
+    Checks the table-driven evaluation against the original one and compares their speed.
+
+    Every position of the suite and every position one move away is evaluated
+    by both functions from both sides; the scores must be identical. The
+    original evaluation runs with the current move generator so that only
+    the evaluation itself is compared.
+    """
+    with swapped(new_ai, "get_valid_moves_bitboard", bitboard.get_valid_moves_bitboard):
+        _bench_eval(args)
+
+def _bench_eval(args):
+    positions = build_positions(args.positions, args.min_empties, args.max_empties, args.seed)
+    leaves = list(positions)
+    for own, opp, move in legal_moves(positions):
+        new_own, new_opp = bitboard.apply_move_bitboard(own, opp, move)
+        leaves.append((new_opp, new_own))
+    for own, opp in leaves:
+        for a, b in ((own, opp), (opp, own)):
+            expected = new_ai.evaluate_bitboard(a, b, True)
+            actual = ai.evaluate_bitboard(a, b, True)
+            assert actual == expected and type(actual) is type(expected), (a, b, expected, actual)
+    print(f"{len(leaves)} positions evaluated identically")
+
+    print(f"{'':<28}{'original':>14}{'current':>14}")
+    report("leaf evaluation", time_evals(new_ai.evaluate_bitboard, leaves, args.repeat, args.rounds),
+           time_evals(ai.evaluate_bitboard, leaves, args.repeat, args.rounds), "calls/s")
+
+    # In the search the current engine evaluates leaves incrementally.
+    with swapped(ai, "evaluate_incremental", scratch_evaluate):
+        mask_nodes, mask_time = run_search(positions, args.depth, args.rounds)
+    nodes, elapsed = run_search(positions, args.depth, args.rounds)
+    assert nodes == mask_nodes
+    report(f"search depth {args.depth} ({nodes} nodes)", mask_nodes / mask_time, nodes / elapsed, "nodes/s")
+
+def bench_flips(args):
+    """
+    Compares the table-driven flip engine with the original ray-walking apply_move_bitboard.
+    """
+    positions = build_positions(args.positions, args.min_empties, args.max_empties, args.seed)
+    cases = legal_moves(positions)
+    for case in cases:
+        assert bitboard.apply_move_bitboard(*case) == new_ai.apply_move_bitboard(*case)
+
+    print(f"{'':<28}{'ray walk':>14}{'flip tables':>14}")
+    report("make move", time_moves(new_ai.apply_move_bitboard, cases, args.repeat, args.rounds),
+           time_moves(bitboard.apply_move_bitboard, cases, args.repeat, args.rounds), "calls/s")
+
+    with swapped(ai, "get_flips_bitboard", ray_walk_flips):
+        walk_nodes, walk_time = run_search(positions, args.depth, args.rounds)
+    nodes, elapsed = run_search(positions, args.depth, args.rounds)
+    assert nodes == walk_nodes
+    report(f"search depth {args.depth} ({nodes} nodes)", walk_nodes / walk_time, nodes / elapsed, "nodes/s")
+
+def bench_search(args):
+    """
+    Compares the node counts of the original alpha-beta search and the current
+    search, both deepening iteratively to the same depth.
+    """
+    positions = build_positions(args.positions, args.min_empties, args.max_empties, args.seed)
+    with swapped(new_ai, "get_valid_moves_bitboard", bitboard.get_valid_moves_bitboard):
+        original_nodes, original_moves = run_original_deepening(positions, args.depth)
+    nodes, moves = run_deepening(positions, args.depth)
+    same = sum(a == b for a, b in zip(original_moves, moves))
+
+    print(f"{'':<28}{'alpha-beta':>14}{'current':>14}")
+    report(f"search depth {args.depth}", original_nodes, nodes, "nodes")
+    print(f"same best move in {same} of {len(positions)} positions")
+
+def bench_multipv(args):
+    """
+    Compares the nodes needed to score every legal move to --depth: one
+    multi-PV analysis sharing its tables, exact and with --margin, and a
+    separate analysis of every move with cold tables. The best-move analysis
+    is shown for scale.
+    """
+    positions = build_positions(args.positions, args.min_empties, args.max_empties, args.seed)
+
+    def analysed_nodes(own, opp, player, depth, multi_pv=False, margin=None):
+        ai.default_engine().new_game()
+        control = SearchControl()
+        board = Board(own, opp) if player == BLACK else Board(opp, own)
+        analysis.analyze(board, player, depth=depth, time_limit=None, multi_pv=multi_pv, control=control, margin=margin)
+        return control.nodes
+
+    single = multi = bounded = separate = 0
+    for own, opp in positions:
+        single += analysed_nodes(own, opp, BLACK, args.depth)
+        multi += analysed_nodes(own, opp, BLACK, args.depth, multi_pv=True)
+        bounded += analysed_nodes(own, opp, BLACK, args.depth, multi_pv=True, margin=args.margin)
+        for _, _, move in legal_moves([(own, opp)]):
+            # After the move the opponent, White, is to move.
+            mover, child = bitboard.apply_move_bitboard(own, opp, move)
+            separate += analysed_nodes(child, mover, WHITE, args.depth - 1)
+
+    print(f"{'':<28}{'per move':>14}{'multi-PV':>14}")
+    report(f"all moves depth {args.depth}", separate, multi, "nodes")
+    report(f"margin {args.margin:g}", separate, bounded, "nodes")
+    print(f"best move only: {single:,} nodes")
+
+def bench_symmetry(args):
+    """
+    Measures the canonical-orientation lookups: the cost of symmetry.canonical,
+    the nodes, TT hit rate and speed of an iterative deepening to --depth
+    with and without canonical transposition table keys (symmetric_discs),
+    from the initial position and the suite, and the size of the opening book.
+    Use --min-empties and --max-empties for early positions, where
+    orientations repeat.
+    """
+    positions = build_positions(args.positions, args.min_empties, args.max_empties, args.seed)
+    print(f"canonical: {time_calls(symmetry.canonical, positions, args.repeat, args.rounds):,.0f} calls/s")
+
+    start = create_board().masks(BLACK)
+    def deepen(symmetric_discs):
+        engine = ai.Engine(symmetric_discs=symmetric_discs)
+        nodes = probes = hits = 0
+        begin = time.perf_counter()
+        for own, opp in [start] + positions:
+            engine.new_game()
+            stats = SearchStats()
+            control = SearchControl(stats=stats)
+            moves_mask = bitboard.get_valid_moves_bitboard(own, opp)
+            engine.search_iterative(own, opp, BLACK, moves_mask, control, max_depth=args.depth)
+            nodes += control.nodes
+            probes += stats.tt_probes
+            hits += stats.tt_hits
+        return nodes, hits / probes, time.perf_counter() - begin
+
+    plain_nodes, plain_rate, plain_time = deepen(0)
+    nodes, rate, elapsed = deepen(64)
+    print(f"{'':<28}{'as is':>14}{'canonical':>14}")
+    report(f"search depth {args.depth}", plain_nodes, nodes, "nodes")
+    report("", plain_nodes / plain_time, nodes / elapsed, "nodes/s")
+    print(f"TT hit rate: {plain_rate:.1%} as is, {rate:.1%} canonical")
+    print(f"opening book: {len(opening_book._book_instance)} canonical positions")
+
+def bench_endgame(args):
+    """
+    Compares the exact endgame solver and the win/loss/draw solver with the
+    heuristic fixed-depth search to the end of the game, on positions with
+    --empties empty squares and a --time-limit budget.
+    """
+    positions = build_positions(args.positions, args.empties, args.empties, args.seed)
+    print(f"{'':<28}{'fixed depth':>14}{'exact':>14}{'wld':>14}")
+
+    def timed(search):
+        solved = 0
+        elapsed = 0.0
+        for own, opp in positions:
+            ai.default_engine().new_game()
+            start = time.perf_counter()
+            if search(own, opp) is not None:
+                solved += 1
+            elapsed += time.perf_counter() - start
+        return solved, elapsed / len(positions)
+
+    results = [
+        timed(lambda own, opp: ai.get_best_move_fixed_depth_bitboard(own, opp, args.empties, args.time_limit, BLACK)),
+        timed(lambda own, opp: endgame.solve_endgame(own, opp, SearchControl(args.time_limit), ai.default_engine().endgame_table)),
+        timed(lambda own, opp: endgame.solve_wld(own, opp, SearchControl(args.time_limit), ai.default_engine().endgame_table)),
+    ]
+    print(f"{f'{args.empties} empties solved':<28}" + "".join(f"{solved:>14}" for solved, _ in results) + f"  of {len(positions)}")
+    print(f"{'average time':<28}" + "".join(f"{elapsed:>14.2f}" for _, elapsed in results) + "  s")
+
+def bench_parallel(args):
+    """
+    Measures how the depth reached and the nodes/s of a timed search scale with
+    the number of worker processes (Lazy SMP with a shared transposition table).
+    """
+    positions = build_positions(args.positions, args.min_empties, args.max_empties, args.seed)
+    counts = sorted({1, args.workers} | {n for n in (2, 4, 8, 16) if n < args.workers})
+    print(f"{'workers':<10}{'depth':>10}{'nodes/s':>14}")
+    baseline = None
+    for workers in counts:
+        depths = 0
+        nodes = 0
+        elapsed = 0.0
+        for own, opp in positions:
+            ai.default_engine().new_game()
+            control = SearchControl(args.time_limit)
+            moves_mask = bitboard.get_valid_moves_bitboard(own, opp)
+            _, _, depth, searched = ai.default_engine().search_iterative(own, opp, BLACK, moves_mask, control, workers=workers)
+            elapsed += control.elapsed()
+            depths += depth
+            nodes += searched
+        rate = nodes / elapsed
+        baseline = baseline or rate
+        print(f"{workers:<10}{depths / len(positions):>10.2f}{rate:>14,.0f}  x{rate / baseline:.2f}")
+
+def bench_ponder(args):
+    """
+    Compares the depth the engine reaches in --time-limit seconds after its
+    opponent's move, with cold tables and after pondering for --ponder-time
+    seconds during the opponent's turn. The opponent plays either the reply
+    the ponder search expected or a random legal move.
+    """
+    positions = build_positions(args.positions, max(args.min_empties, ai.WLD_EMPTIES + 2), args.max_empties, args.seed)
+    rng = random.Random(args.seed)
+    ponderer = Ponderer()
+    depths = {(kind, warm): 0 for kind in ("predicted", "random") for warm in (False, True)}
+    samples = 0
+
+    def reply_search(own, opp, reply, warm):
+        # own/opp are the opponent's bitboards before its reply.
+        engine_opp, engine_own = bitboard.apply_move_bitboard(own, opp, reply)
+        moves_mask = bitboard.get_valid_moves_bitboard(engine_own, engine_opp)
+        if not warm:
+            ai.default_engine().new_game()
+        ai.default_engine().table.new_search()
+        ai.default_engine().ordering.new_search()
+        control = SearchControl(args.time_limit)
+        return ai.default_engine().search_iterative(engine_own, engine_opp, WHITE, moves_mask, control)[2]
+
+    for own, opp in positions:
+        replies = [move for _, _, move in legal_moves([(own, opp)])]
+        for kind in ("predicted", "random"):
+            ai.default_engine().new_game()
+            ponderer.start(TurnState(Board(own, opp), BLACK))
+            time.sleep(args.ponder_time)
+            predicted = ponderer.stop()
+            reply = predicted if kind == "predicted" and predicted else rng.choice(replies)
+            if not bitboard.get_valid_moves_bitboard(*reversed(bitboard.apply_move_bitboard(own, opp, reply))):
+                break
+            depths[kind, True] += reply_search(own, opp, reply, True)
+            depths[kind, False] += reply_search(own, opp, reply, False)
+        else:
+            samples += 1
+
+    print(f"{'':<28}{'cold':>14}{'pondered':>14}")
+    for kind in ("predicted", "random"):
+        print(f"{f'{kind} reply depth':<28}{depths[kind, False] / samples:>14.2f}{depths[kind, True] / samples:>14.2f}")
+
+def bench_stats(args):
+    """
+    Runs get_best_move with statistics on every position (--time-limit seconds
+    each) and writes them as JSON lines to --output, or to stdout.
+    """
+    positions = build_positions(args.positions, args.min_empties, args.max_empties, args.seed)
+    out = open(args.output, "w") if args.output else sys.stdout
+    totals = SearchStats()
+    try:
+        for index, (own, opp) in enumerate(positions):
+            ai.default_engine().new_game()
+            stats = SearchStats()
+            board = Board(own, opp)
+            ai.get_best_move(board, BLACK, time_limit=args.time_limit, turn=TurnState(board, BLACK), stats=stats)
+            empties = 64 - (own | opp).bit_count()
+            out.write(stats.to_json(position=index, empties=empties) + "\n")
+            for name in ("nodes", "time", "tt_probes", "tt_hits", "beta_cutoffs", "first_move_cutoffs"):
+                setattr(totals, name, getattr(totals, name) + getattr(stats, name))
+    finally:
+        if args.output:
+            out.close()
+    print(f"{len(positions)} positions: {totals.nodes / totals.time:,.0f} nodes/s, "
+          f"TT hit rate {totals.tt_hit_rate:.1%}, first-move cutoffs {totals.first_move_cutoff_rate:.1%}",
+          file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the bitboard search engine.")
+    parser.add_argument("benchmark", choices=["movegen", "flips", "eval", "search", "endgame", "parallel", "ponder", "stats", "multipv", "symmetry"], help="The benchmark to run.")
+    parser.add_argument("--positions", type=int, default=40, help="Number of positions in the suite.")
+    parser.add_argument("--min-empties", type=int, default=12, help="Minimum empty squares per position.")
+    parser.add_argument("--max-empties", type=int, default=48, help="Maximum empty squares per position.")
+    parser.add_argument("--seed", type=int, default=2025, help="Random seed for the position suite.")
+    parser.add_argument("--depth", type=int, default=4, help="Fixed search depth.")
+    parser.add_argument("--empties", type=int, default=14, help="Empty squares per position for the endgame benchmark.")
+    parser.add_argument("--time-limit", type=float, default=10.0, help="Time budget per position for the endgame, parallel, ponder and stats benchmarks.")
+    parser.add_argument("--ponder-time", type=float, default=2.0, help="Seconds to ponder for the ponder benchmark.")
+    parser.add_argument("--margin", type=float, default=25.0, help="Exact-score margin of the bounded multi-PV analysis.")
+    parser.add_argument("--output", help="File for the JSON lines of the stats benchmark (default: stdout).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Largest worker count for the parallel benchmark.")
+    parser.add_argument("--repeat", type=int, default=100, help="Passes over the suite for micro-benchmarks.")
+    parser.add_argument("--rounds", type=int, default=5, help="Timing rounds; the fastest round is reported.")
+    args = parser.parse_args()
+
+    if args.benchmark == "movegen":
+        bench_movegen(args)
+    elif args.benchmark == "flips":
+        bench_flips(args)
+    elif args.benchmark == "eval":
+        bench_eval(args)
+    elif args.benchmark == "search":
+        bench_search(args)
+    elif args.benchmark == "endgame":
+        bench_endgame(args)
+    elif args.benchmark == "parallel":
+        bench_parallel(args)
+    elif args.benchmark == "ponder":
+        bench_ponder(args)
+    elif args.benchmark == "stats":
+        bench_stats(args)
+    elif args.benchmark == "multipv":
+        bench_multipv(args)
+    elif args.benchmark == "symmetry":
+        bench_symmetry(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import time
+
+DEFAULT_GAME_TIME = 60.0
+DEFAULT_INCREMENT = 0.5
+
+# Time kept back from every budget for the work around the search.
+SAFETY_MARGIN = 0.05
+MIN_BUDGET = 0.01
+
+# Positions with at most this many empty squares are solved exactly by the
+# engine, and once solved the rest of the game costs almost nothing, so the
+# clock is shared out as if the game ended there.
+SOLVED_EMPTIES = 14
+
+# PHASE_FACTORS[empty_count] scales the even share of the clock: less in the
+# opening, more in the late midgame where the endgame solves begin.
+PHASE_FACTORS = [1.0] * 15 + [1.2] * 10 + [1.0] * 20 + [0.6] * 20
+
+# The hard limit lets a move run this many times over its soft budget, but
+# never past this fraction of the clock.
+HARD_FACTOR = 2.5
+MAX_FRACTION = 0.25
+
+# Share of the hard budget the endgame solvers may use. If they do not
+# finish, the normal search gets the rest.
+SOLVE_SHARE = 0.75
+
+# Share of the increment spent on the move that earns it.
+INCREMENT_USE = 0.8
+
+# When the best move changes between iterations, the soft budget grows by
+# this fraction of itself (up to the hard limit).
+BEST_MOVE_EXTENSION = 0.5
+
+# Bounds on the predicted growth of one iteration over the previous one.
+MIN_GROWTH = 2.0
+MAX_GROWTH = 8.0
+
+class TimeManager:
+    """
+    Runs a player's game clock and splits it into per-move budgets.
+
+    The caller brackets every move with start_move() and end_move(), which
+    charge the time spent to the clock and add the increment. The search
+    asks budget() for the time it may use on the current move.
+    """
+    def __init__(self, total_time=DEFAULT_GAME_TIME, increment=DEFAULT_INCREMENT):
+        """
+        Initialize the clock.
+
+        Args:
+            total_time (float): Seconds on the clock for the whole game.
+            increment (float): Seconds added to the clock after every move.
+        """
+        self.remaining = total_time
+        self.increment = increment
+        self._move_start = None
+
+    def start_move(self):
+        """Starts the clock for a move."""
+        self._move_start = time.time()
+
+    def elapsed(self):
+        """
+        Measures the time spent on the current move so far.
+
+        Returns:
+            float: The seconds since start_move, or 0.0 when the clock is stopped.
+        """
+        if self._move_start is None:
+            return 0.0
+        return time.time() - self._move_start
+
+    def end_move(self):
+        """
+        Stops the clock for a move, charges the time spent and adds the increment.
+
+        Returns:
+            float: The seconds spent on the move.
+        """
+        elapsed = self.elapsed()
+        self._move_start = None
+        self.remaining = max(0.0, self.remaining - elapsed) + self.increment
+        return elapsed
+
+    def budget(self, empty_count):
+        """
+        Computes the time budget for a move.
+
+        The clock is shared evenly over the moves left until the exact
+        endgame solve, scaled by the game phase. The soft budget is what the
+        search aims to use; the hard budget is the deadline it must not cross.
+        Time already spent on the current move (e.g. waiting for a free
+        engine) is taken off the clock first.
+
+        Args:
+            empty_count (int): The number of empty squares on the board.
+
+        Returns:
+            tuple: A tuple (soft, hard) of budgets in seconds.
+        """
+        available = max(0.0, self.remaining - self.elapsed() - SAFETY_MARGIN)
+        moves_to_go = max(1, (empty_count - SOLVED_EMPTIES + 1) // 2 + 1)
+        soft = available / moves_to_go * PHASE_FACTORS[empty_count] + self.increment * INCREMENT_USE
+        hard = min(soft * HARD_FACTOR, available * MAX_FRACTION + self.increment * INCREMENT_USE)
+        hard = max(hard, MIN_BUDGET)
+        return max(min(soft, hard), MIN_BUDGET), hard
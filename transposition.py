@@ -0,0 +1,309 @@
+import math
+import random
+from array import array
+from multiprocessing import shared_memory
+
+# Zobrist Hashing
+# Every (square, color) pair and the side to move get a fixed random 64-bit
+# number; a position's key is the XOR of the numbers of everything on it.
+# Keys are updated incrementally during make-move instead of being recomputed.
+# The generator is seeded so every process derives the same keys.
+_rng = random.Random(0x07E110)
+
+ZOBRIST_BLACK = {}
+ZOBRIST_WHITE = {}
+ZOBRIST_FLIP = {}
+for sq in range(64):
+    bit = 1 << sq
+    ZOBRIST_BLACK[bit] = _rng.getrandbits(64)
+    ZOBRIST_WHITE[bit] = _rng.getrandbits(64)
+    # Flipping a piece removes it from one color and adds it to the other.
+    ZOBRIST_FLIP[bit] = ZOBRIST_BLACK[bit] ^ ZOBRIST_WHITE[bit]
+ZOBRIST_SIDE = _rng.getrandbits(64)
+
+def zobrist_key(black, white, black_to_move):
+    """
+    Computes the Zobrist key of a position from scratch.
+
+    Args:
+        black (int): Bitboard of Black's pieces.
+        white (int): Bitboard of White's pieces.
+        black_to_move (bool): True if Black is the side to move.
+
+    Returns:
+        int: The 64-bit Zobrist key.
+    """
+    key = ZOBRIST_SIDE if black_to_move else 0
+    while black:
+        bit = black & -black
+        key ^= ZOBRIST_BLACK[bit]
+        black ^= bit
+    while white:
+        bit = white & -white
+        key ^= ZOBRIST_WHITE[bit]
+        white ^= bit
+    return key
+
+def zobrist_move(key, move_mask, flips, black_moved):
+    """
+    Updates a Zobrist key for a move: the placed piece, the flipped pieces and the side to move.
+
+    Args:
+        key (int): The key of the position before the move.
+        move_mask (int): A bitboard with a single bit set representing the move.
+        flips (int): A bitboard of the pieces flipped by the move.
+        black_moved (bool): True if Black made the move.
+
+    Returns:
+        int: The key of the position after the move.
+    """
+    key ^= (ZOBRIST_BLACK if black_moved else ZOBRIST_WHITE)[move_mask] ^ ZOBRIST_SIDE
+    while flips:
+        bit = flips & -flips
+        key ^= ZOBRIST_FLIP[bit]
+        flips ^= bit
+    return key
+
+DEFAULT_TT_SIZE_MB = 32
+
+# Entry Layout
+# Each slot is spread over parallel preallocated arrays instead of a Python
+# object per entry: the 64-bit key, the two bitboards (kept to verify the
+# full position), a 16-bit fixed-point score, an 8-bit depth, a byte holding
+# the 2-bit bound and 6-bit generation, and the best-move square.
+ENTRY_BYTES = 8 + 8 + 8 + 2 + 1 + 1 + 1
+
+# Bound types. 0 marks an empty slot.
+UPPERBOUND = 1
+LOWERBOUND = 2
+EXACT = 3
+
+# Scores are stored in 1/16ths, which keeps every evaluation well inside 16 bits.
+SCORE_SCALE = 16
+SCORE_MAX = 32767
+
+NO_MOVE = 255
+GENERATIONS = 64
+
+# Field formats and sizes, in the order they are laid out in a shared buffer
+# (widest first, so every field stays aligned).
+FIELDS = [('_keys', 'Q', 8), ('_own', 'Q', 8), ('_opp', 'Q', 8), ('_scores', 'h', 2),
+          ('_depths', 'B', 1), ('_meta', 'B', 1), ('_moves', 'B', 1)]
+
+class TranspositionTable:
+    """
+    A fixed-capacity transposition table indexed by Zobrist key.
+
+    The table holds a power-of-two number of buckets, sized from a memory
+    budget in MB. Each bucket has two slots:
+
+    * a depth-preferred slot, which keeps the deepest result for its index
+      and is only overwritten by a search at least as deep, by the same
+      position, or when its entry is stale;
+    * an always-replace slot, which takes every store the depth-preferred
+      slot rejects, so recent shallow results are still available.
+
+    A generation counter is advanced once per move searched (see
+    new_search). Entries written during earlier moves are stale: they can
+    still be read, but they lose their depth protection, so they are
+    evicted before anything written during the current search.
+
+    Entries are packed into preallocated ``array`` buffers (see ENTRY_BYTES),
+    so storing a result allocates nothing. Scores are kept in fixed point;
+    bounds are rounded outwards so they stay valid bounds.
+
+    The table can also live in a ``multiprocessing.shared_memory`` segment
+    (see share and attach), so that search processes share their results.
+    Access is lockless: a probe checks the full position, but an entry that
+    is being written by another process at the same time may pair it with
+    the other writer's score. Like other lockless tables, this rare corrupt
+    bound is accepted in exchange for never waiting.
+    """
+    def __init__(self, size_mb=DEFAULT_TT_SIZE_MB):
+        """
+        Initialize the table.
+
+        Args:
+            size_mb (float): The memory budget in megabytes.
+        """
+        self.generation = 0
+        self._shm = None
+        self.resize(size_mb)
+
+    def resize(self, size_mb):
+        """
+        Reallocates the table for a new memory budget, discarding all entries.
+
+        Args:
+            size_mb (float): The memory budget in megabytes.
+        """
+        self._release()
+        self._set_size(size_mb)
+        for name, fmt, size in FIELDS:
+            setattr(self, name, array(fmt, bytes(size * self.slots)))
+
+    def _set_size(self, size_mb):
+        """
+        Sets the size attributes for a memory budget.
+
+        Args:
+            size_mb (float): The memory budget in megabytes.
+        """
+        buckets = max(1, int(size_mb * 1024 * 1024) // (2 * ENTRY_BYTES))
+        # Round down to a power of two so the index is a single mask.
+        buckets = 1 << (buckets.bit_length() - 1)
+        self.size_mb = size_mb
+        self.mask = buckets - 1
+        self.slots = 2 * buckets
+
+    @property
+    def shared_name(self):
+        """str or None: The name of the shared memory segment holding the table, if any."""
+        return self._shm.name if self._shm is not None else None
+
+    def share(self):
+        """
+        Moves the table into a new shared memory segment, discarding all entries.
+
+        Returns:
+            str: The name of the segment, to be passed to attach in other processes.
+        """
+        if self._shm is None:
+            shm = shared_memory.SharedMemory(create=True, size=ENTRY_BYTES * self.slots)
+            self._map(shm)
+            self._owner = True
+        return self._shm.name
+
+    def attach(self, name, size_mb):
+        """
+        Uses a table shared by another process instead of this one's entries.
+
+        Args:
+            name (str): The name of the segment, as returned by share.
+            size_mb (float): The memory budget the sharing table was created with.
+        """
+        # A table inherited through fork may still point at the segment;
+        # this process did not create it, so must not unlink it.
+        self._owner = False
+        self._release()
+        self._set_size(size_mb)
+        self._map(shared_memory.SharedMemory(name=name))
+
+    def _map(self, shm):
+        """
+        Points the entry fields at consecutive regions of a shared memory segment.
+
+        Args:
+            shm (SharedMemory): The segment, at least ENTRY_BYTES per slot.
+        """
+        self._shm = shm
+        offset = 0
+        for name, fmt, size in FIELDS:
+            end = offset + size * self.slots
+            setattr(self, name, shm.buf[offset:end].cast(fmt))
+            offset = end
+
+    def _release(self):
+        """Stops using the shared memory segment, if any, unlinking it if this table created it."""
+        if self._shm is None:
+            return
+        for name, _, _ in FIELDS:
+            getattr(self, name).release()
+            setattr(self, name, None)
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def clear(self):
+        """Discards all entries, keeping the current size."""
+        # A slot with no bound is empty whatever its other fields hold.
+        memoryview(self._meta)[:] = bytes(self.slots)
+
+    def new_search(self):
+        """Advances the generation so entries from earlier moves become stale."""
+        self.generation = (self.generation + 1) % GENERATIONS
+
+    def probe(self, key, own, opp):
+        """
+        Looks up a position.
+
+        Args:
+            key (int): The Zobrist key of the position.
+            own (int): Bitboard for the first player of the stored position.
+            opp (int): Bitboard for the second player of the stored position.
+
+        Returns:
+            tuple or None: A tuple (value, depth, bound, move) where move is the
+            best move's square index or NO_MOVE, or None if the position is not stored.
+        """
+        i = (key & self.mask) << 1
+        keys = self._keys
+        if keys[i] != key or self._own[i] != own or self._opp[i] != opp or not self._meta[i]:
+            i += 1
+            if keys[i] != key or self._own[i] != own or self._opp[i] != opp or not self._meta[i]:
+                return None
+        else:
+            meta = self._meta[i]
+            if meta >> 2 != self.generation:
+                # Still useful in this search, so protect it again.
+                self._meta[i] = (self.generation << 2) | (meta & 3)
+        return self._scores[i] / SCORE_SCALE, self._depths[i], self._meta[i] & 3, self._moves[i]
+
+    def store(self, key, own, opp, value, depth, bound, move=NO_MOVE):
+        """
+        Stores a search result, applying the replacement policy.
+
+        Args:
+            key (int): The Zobrist key of the position.
+            own (int): Bitboard for the first player of the position.
+            opp (int): Bitboard for the second player of the position.
+            value (float): The score found.
+            depth (int): The depth the position was searched to.
+            bound (int): EXACT, LOWERBOUND or UPPERBOUND.
+            move (int, optional): The best move's square index, or NO_MOVE.
+        """
+        if bound == LOWERBOUND:
+            score = math.floor(value * SCORE_SCALE)
+        elif bound == UPPERBOUND:
+            score = math.ceil(value * SCORE_SCALE)
+        else:
+            score = round(value * SCORE_SCALE)
+        score = max(-SCORE_MAX, min(SCORE_MAX, score))
+
+        i = (key & self.mask) << 1
+        meta = self._meta[i]
+        if (not meta or self._keys[i] == key or meta >> 2 != self.generation
+                or depth >= self._depths[i]):
+            if meta and self._keys[i] != key:
+                # The displaced entry still gets a chance in the always-replace slot.
+                self._copy(i, i + 1)
+        else:
+            i += 1
+        self._keys[i] = key
+        self._own[i] = own
+        self._opp[i] = opp
+        self._scores[i] = score
+        self._depths[i] = depth
+        self._meta[i] = (self.generation << 2) | bound
+        self._moves[i] = move
+
+    def _copy(self, src, dst):
+        """
+        Copies one slot over another.
+
+        Args:
+            src (int): The source slot index.
+            dst (int): The destination slot index.
+        """
+        self._keys[dst] = self._keys[src]
+        self._own[dst] = self._own[src]
+        self._opp[dst] = self._opp[src]
+        self._scores[dst] = self._scores[src]
+        self._depths[dst] = self._depths[src]
+        self._meta[dst] = self._meta[src]
+        self._moves[dst] = self._moves[src]
+
+    def __len__(self):
+        """Returns the number of stored entries."""
+        return self.slots - bytes(self._meta).count(0)
@@ -1,4 +1,5 @@
 import os
+import sys
 import time
 import bext
 from colorama import init, Fore, Style
@@ -88,6 +89,54 @@ def print_message(msg):
     """
     print(msg)
 
+def print_progress(progress):
+    """
+    Prints the search progress over the previous progress line.
+
+    Args:
+        progress (tuple): A tuple (depth, score, nodes, nodes_per_second) as
+                          reported by EngineWorker.progress(), or None.
+    """
+    if progress is None:
+        return
+    depth, score, nodes, nodes_per_second = progress
+    if depth:
+        line = f"Depth {depth}  Score {score:+.2f}  Nodes {nodes:,}  ({nodes_per_second / 1000:.1f} kN/s)"
+    else:
+        line = f"Searching...  Nodes {nodes:,}  ({nodes_per_second / 1000:.1f} kN/s)"
+    print("\r" + line + " " * 8, end='', flush=True)
+
+def wait_for_enter(timeout):
+    """
+    Waits up to timeout seconds for the Enter key.
+
+    Args:
+        timeout (float): The number of seconds to wait.
+
+    Returns:
+        bool: True if Enter was pressed.
+    """
+    if os.name == 'nt':
+        import msvcrt
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if msvcrt.kbhit() and msvcrt.getwch() == '\r':
+                return True
+            time.sleep(0.02)
+        return False
+
+    import select
+    try:
+        if not select.select([sys.stdin], [], [], timeout)[0]:
+            return False
+        if sys.stdin.readline():
+            return True
+    except (OSError, ValueError):
+        pass
+    # No usable terminal (e.g. input at end of file): just wait.
+    time.sleep(timeout)
+    return False
+
 def animate_flip(flipped_groups, player, placed_pos=None):
     """
     Animates the flipping of pieces on the board.